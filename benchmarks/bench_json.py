@@ -0,0 +1,55 @@
+"""benchmarks for json serialization. run with airspeed velocity, e.g. `asv run`"""
+import json
+import pathlib
+import tempfile
+from ipyautoui import _utils
+from ipyautoui.test_schema import TestAutoLogic
+
+BACKENDS = [
+    b for b in _utils.JSON_BACKENDS if b == "json" or _utils.check_installed(b)
+]
+
+
+class TimeJson:
+    params = (BACKENDS, [4, None])
+    param_names = ["backend", "indent"]
+
+    def setup(self, backend, indent):
+        self.model = TestAutoLogic()
+        row = json.loads(self.model.json())
+        self.data = {"rows": [dict(row, index=n) for n in range(1000)]}
+        self.s = _utils.dumps(self.data, indent=indent, backend=backend)
+
+    def time_dumps(self, backend, indent):
+        _utils.dumps(self.data, indent=indent, backend=backend)
+
+    def time_loads(self, backend, indent):
+        _utils.loads(self.s, backend=backend)
+
+    def time_model_dumps(self, backend, indent):
+        _utils.model_dumps(self.model, indent=indent, backend=backend)
+
+    def track_size(self, backend, indent):
+        return len(self.s)
+
+
+class TimeJsonFile:
+    params = BACKENDS
+    param_names = ["backend"]
+
+    def setup(self, backend):
+        rows = [{"a": n, "b": str(n), "c": [n] * 10} for n in range(10000)]
+        self.data = {"rows": rows}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmp.name) / "bench.json"
+
+    def teardown(self, backend):
+        self.tmp.cleanup()
+
+    def time_write_read(self, backend):
+        _utils.JSON_BACKEND, default = backend, _utils.JSON_BACKEND
+        try:
+            _utils.write_json(self.data, self.path, indent=None)
+            _utils.read_json(self.path)
+        finally:
+            _utils.JSON_BACKEND = default
@@ -14,6 +14,15 @@ import importlib.util
 import inspect
 import immutables
 import getpass
+import asyncio
+import re
+import numbers
+import numpy as np
+import os
+import tempfile
+import threading
+import concurrent.futures
+import itertools
 
 frozenmap = immutables.Map
 
@@ -87,31 +96,125 @@ def write_json(data, fpth="data.json", sort_keys=True, indent=4):
     Args:
         data
         ** sort_keys = True
-        ** indent=4
+        ** indent=4 (None for compact output)
         ** fpth='data.json'
         
     Code:
-        out=json.dumps(data, sort_keys=sort_keys, indent=indent)
-        f = open(fpth,"w")
-        f.write(out)
-        f.close()
-    """
-    out = json.dumps(data, sort_keys=sort_keys, indent=indent)
-    f = open(fpth, "w")
-    f.write(out)
-    f.close()
+        out=dumps(data, sort_keys=sort_keys, indent=indent)
+        write_text_atomic(fpth, out)
+    """
+    out = dumps(data, sort_keys=sort_keys, indent=indent)
+    write_text_atomic(fpth, out)
     return fpth
 
 
+def write_text_atomic(path, text: str, encoding="utf-8"):
+    """writes text to a temporary file in the same folder which then replaces path.
+    path is therefore never left partially written (e.g. if interrupted).
+
+    Args:
+        path: file to write to
+        text (str): text to write
+        encoding (str, optional): Defaults to "utf-8".
+    """
+    path = pathlib.Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.is_file():
+            os.chmod(tmp, path.stat().st_mode)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+class WriteBehindQueue:
+    """writes files in a background thread. writes to the same path that are queued
+    whilst an earlier one is still waiting are coalesced: only the latest is written.
+    `on_done(path, error)` is called after each write; on the event loop of the
+    thread that queued the write if one was running, else from the writer thread.
+    """
+
+    def __init__(self, on_done: typing.Callable = None):
+        self.on_done = on_done
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._pending = {}  # path: (fn_text, future, loop)
+
+    def put(self, path, fn_text: typing.Callable) -> concurrent.futures.Future:
+        """queue a write. fn_text() returns the text and is called in the writer thread.
+
+        Returns:
+            concurrent.futures.Future: completes once the (latest) text is written
+        """
+        path = pathlib.Path(path)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            if path in self._pending:
+                _, future, _ = self._pending[path]
+                self._pending[path] = (fn_text, future, loop)
+                return future
+            future = concurrent.futures.Future()
+            self._pending[path] = (fn_text, future, loop)
+        self._executor.submit(self._write, path)
+        return future
+
+    def _write(self, path):
+        with self._lock:
+            fn_text, future, loop = self._pending.pop(path)
+        error = None
+        try:
+            write_text_atomic(path, fn_text())
+            future.set_result(path)
+        except Exception as e:
+            error = e
+            future.set_exception(e)
+        if self.on_done is not None:
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self.on_done, path, error)
+            else:
+                self.on_done(path, error)
+
+    def flush(self):
+        """blocks until all queued writes are complete"""
+        self._executor.submit(lambda: None).result()
+
+    def close(self):
+        """completes the queued writes and then stops the writer thread. no more
+        writes can be queued."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
 def read_json(fpth, encoding="utf8"):
     """
     read info in a .json file
     """
     with open(fpth, "r", encoding=encoding) as f:
-        json_file = json.loads(f.read())
+        json_file = loads(f.read())
     return json_file
 
 
+def close_widget(widget):
+    """closes a widget and, recursively, its children. closing a widget closes its
+    comm such that it is no longer held by the kernel (or front end)"""
+    for child in getattr(widget, "children", ()):
+        close_widget(child)
+    if isinstance(widget, widgets.Widget):
+        widget.close()
+
+
 def del_cols(df, cols):
     """delete a pandas column if it is in
     the column index otherwise ignore it. """
@@ -237,15 +340,170 @@ def file(self: Type[BaseModel], path: pathlib.Path, **json_kwargs):
     """
     if "indent" not in json_kwargs.keys():
         json_kwargs.update({"indent": 4})
-    path.write_text(self.json(**json_kwargs), encoding="utf-8")
+    write_text_atomic(path, model_dumps(self, **json_kwargs), encoding="utf-8")
 
 
-def round_sig_figs(x: float, sig_figs: int):
-    if x > 0:
-        sig = sig_figs
-        return round(x, sig - int(floor(log10(abs(x)))) - 1)
-    else:
-        return x
+def parse_update_policy(policy: typing.Optional[str]) -> typing.Tuple[str, float]:
+    """parses an "update_policy" string. allowed values are:
+    - None or "continuous": every change is propagated
+    - "on_blur": changes are only sent when the widget loses focus (or enter is pressed)
+    - "debounce" or "debounce:<wait>": a burst of changes is collapsed into one. wait is
+      given in ms (default) or s, e.g. "debounce:300ms", "debounce:0.5s". default 300ms
+
+    Returns:
+        (mode, wait): mode is one of "continuous", "on_blur", "debounce", wait in seconds
+
+    Example:
+        >>> parse_update_policy("debounce:300ms")
+        ('debounce', 0.3)
+        >>> parse_update_policy("on_blur")
+        ('on_blur', 0.0)
+    """
+    if policy is None or policy == "continuous":
+        return "continuous", 0.0
+    if policy == "on_blur":
+        return "on_blur", 0.0
+    m = re.fullmatch(r"debounce(?::\s*(\d+(?:\.\d+)?)\s*(ms|s)?)?", policy.strip())
+    if m is None:
+        raise ValueError(
+            f'update_policy = {policy}. must be one of: None, "continuous", "on_blur",'
+            ' "debounce" or "debounce:<wait>ms"'
+        )
+    if m.group(1) is None:
+        return "debounce", 0.3
+    wait = float(m.group(1))
+    if m.group(2) != "s":
+        wait = wait / 1000
+    return "debounce", wait
+
+
+class Debouncer:
+    """wraps a callable such that a burst of calls is collapsed into a single call,
+    made with the arguments of the last call once `wait` seconds have passed without
+    another call. uses the running asyncio event loop (i.e. the kernel's). if no loop
+    is running the callable is called immediately.
+    """
+
+    def __init__(self, fn: typing.Callable, wait: float = 0.3):
+        self.fn = fn
+        self.wait = wait
+        self._handle = None
+        self._pending = None
+
+    def __call__(self, *args, **kwargs):
+        self._pending = (args, kwargs)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self.cancel()
+        self._handle = loop.call_later(self.wait, self.flush)
+
+    @property
+    def is_pending(self):
+        return self._pending is not None
+
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def discard(self):
+        """drops the pending call (if any) without calling fn"""
+        self.cancel()
+        self._pending = None
+
+    def flush(self):
+        """calls fn now if a call is pending"""
+        self.cancel()
+        if self._pending is not None:
+            args, kwargs = self._pending
+            self._pending = None
+            self.fn(*args, **kwargs)
+
+
+def run_sync(coro):
+    """runs a coroutine that never suspends (i.e. it only awaits code that runs
+    synchronously) to completion and returns its result. unlike `asyncio.run` this
+    can be called whilst an event loop is running (e.g. in a Jupyter kernel).
+
+    Example:
+        >>> async def add(a, b):
+        ...     return a + b
+        >>> run_sync(add(1, 2))
+        3
+    """
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    coro.close()
+    raise RuntimeError("the coroutine suspended. run it on an asyncio event loop.")
+
+
+class Throttler(Debouncer):
+    """like Debouncer, but the call is made `wait` seconds after the first call of a
+    burst rather than the last. a continuous burst of calls therefore still calls fn
+    (with the latest arguments) once every `wait` seconds.
+    """
+
+    def __call__(self, *args, **kwargs):
+        self._pending = (args, kwargs)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._handle is None:
+            self._handle = loop.call_later(self.wait, self.flush)
+
+
+def round_sig_figs(x, sig_figs: int):
+    """round to significant figures. x can be a number or an array of numbers, which
+    is rounded column-wise with numpy rather than number by number. negative numbers
+    are rounded by magnitude; 0, NaN, inf and non-numeric values are returned unchanged.
+
+    Example:
+        >>> round_sig_figs(1234.5, 2)
+        1200.0
+        >>> round_sig_figs(-0.012345, 3)
+        -0.0123
+        >>> round_sig_figs(np.array([3.14159, -271.8, 0, np.nan]), 3).tolist()
+        [3.14, -272.0, 0.0, nan]
+    """
+    if np.ndim(x) == 0:
+        if isinstance(x, bool) or not isinstance(x, numbers.Real):
+            return x
+        if x == 0 or not np.isfinite(x):
+            return x
+        return round(x, sig_figs - int(floor(log10(abs(x)))) - 1)
+
+    arr = np.asarray(x)
+    try:
+        values = arr.astype(float)
+    except (TypeError, ValueError):  # e.g. object array containing strings
+        return np.array([round_sig_figs(v, sig_figs) for v in arr], dtype=object)
+    mask = np.isfinite(values) & (values != 0)
+    magnitude = np.zeros_like(values)
+    magnitude[mask] = np.floor(np.log10(np.abs(values[mask])))
+    decimals = sig_figs - 1 - magnitude
+    with np.errstate(over="ignore", invalid="ignore"):
+        scale = np.power(10.0, np.abs(decimals))
+        rounded = np.where(
+            decimals >= 0,
+            np.round(values * scale) / scale,
+            np.round(values / scale) * scale,
+        )
+    mask &= np.isfinite(rounded)  # i.e. denormal numbers are left as they are
+    rounded = np.where(mask, rounded, values)
+    if arr.dtype.kind in "iu":
+        return rounded.astype(arr.dtype)
+    if arr.dtype.kind == "O":
+        out = arr.copy()
+        out[mask] = rounded[mask]
+        return out  # keep None etc. as they were
+    return rounded
 
 
 class PyObj(BaseModel):
@@ -440,3 +698,216 @@ def check_installed(package_name):
         return False
     else:
         return True
+
+
+# json serialization
+# ------------------
+# orjson or msgspec are used in place of the stdlib json module if installed.
+# orjson can only indent by 2 spaces, so for other indents it is only used if
+# compact (indent=None) output is requested.
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+_INSTALLED_JSON_BACKENDS = tuple(
+    b for b in JSON_BACKENDS if b == "json" or check_installed(b)
+)  # ^ resolved once on import rather than on every dumps / loads
+JSON_BACKEND = _INSTALLED_JSON_BACKENDS[0]
+
+if "orjson" in _INSTALLED_JSON_BACKENDS:
+    import orjson
+if "msgspec" in _INSTALLED_JSON_BACKENDS:
+    import msgspec
+
+
+def _get_json_backend(backend: typing.Optional[str] = None) -> str:
+    backend = JSON_BACKEND if backend is None else backend
+    if backend in _INSTALLED_JSON_BACKENDS:
+        return backend
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"json backend must be one of: {JSON_BACKENDS}")
+    raise ValueError(f"json backend '{backend}' is not installed")
+
+
+def dumps(
+    obj,
+    indent: typing.Optional[int] = 4,
+    sort_keys: bool = False,
+    default: typing.Callable = None,
+    backend: typing.Optional[str] = None,
+) -> str:
+    """serialize obj to a json string using the fastest available backend.
+
+    Args:
+        obj: python object to serialize
+        indent (int, optional): Defaults to 4. None (or 0) gives compact output
+        sort_keys (bool, optional): Defaults to False.
+        default (typing.Callable, optional): called for objects that aren't
+            natively serializable. Defaults to None.
+        backend (str, optional): one of JSON_BACKENDS. Defaults to JSON_BACKEND.
+
+    Returns:
+        str: json
+    """
+    backend = _get_json_backend(backend)
+    if backend == "orjson" and indent in (None, 0, 2):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+    elif backend == "msgspec":
+        s = msgspec.json.encode(
+            obj, enc_hook=default, order="sorted" if sort_keys else None
+        )
+        if indent:
+            s = msgspec.json.format(s, indent=indent)
+        return s.decode("utf-8")
+    elif indent:
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=default)
+    else:
+        return json.dumps(
+            obj, sort_keys=sort_keys, default=default, separators=(",", ":")
+        )
+
+
+def loads(s: typing.Union[str, bytes], backend: typing.Optional[str] = None):
+    """deserialize a json string (or bytes) using the fastest available backend.
+
+    Args:
+        s (typing.Union[str, bytes]): json
+        backend (str, optional): one of JSON_BACKENDS. Defaults to JSON_BACKEND.
+    """
+    backend = _get_json_backend(backend)
+    if backend == "orjson":
+        return orjson.loads(s)
+    elif backend == "msgspec":
+        return msgspec.json.decode(s)
+    else:
+        return json.loads(s)
+
+
+_MODEL_DICT_KWARGS = frozenset(
+    (
+        "include",
+        "exclude",
+        "by_alias",
+        "skip_defaults",
+        "exclude_unset",
+        "exclude_defaults",
+        "exclude_none",
+    )
+)  # ^ kwargs of pydantic `BaseModel.dict`
+
+
+def model_dumps(
+    model: BaseModel,
+    indent: typing.Optional[int] = 4,
+    sort_keys: bool = False,
+    backend: typing.Optional[str] = None,
+    **kwargs,
+) -> str:
+    """equivalent to `model.json(indent=indent, **kwargs)` but serialized with
+    `dumps`. the model's own encoder (incl. `Config.json_encoders`) is used for
+    objects the backend cannot serialize. kwargs are passed to `model.dict`. if
+    other kwargs are given (e.g. `ensure_ascii` for `json.dumps`) `model.json` is
+    used instead.
+    """
+    if not _MODEL_DICT_KWARGS.issuperset(kwargs):
+        return model.json(indent=indent, sort_keys=sort_keys, **kwargs)
+    return dumps(
+        model.dict(**kwargs),
+        indent=indent,
+        sort_keys=sort_keys,
+        default=model.__json_encoder__,
+        backend=backend,
+    )
+
+
+if check_installed("ijson"):
+    import ijson
+
+
+def iter_json_file(
+    path,
+    stream_keys: typing.Iterable = (),
+    chunk_size: int = 100,
+    max_chunk_size: int = 10000,
+) -> typing.Iterator[typing.Tuple[str, typing.Any]]:
+    """iterates over the fields of a json file containing an object, yielding
+    `(key, value)`. the arrays of `stream_keys` are yielded in chunks as
+    `(key, rows)` (possibly many times for one key), the chunks growing geometrically
+    from chunk_size to max_chunk_size. The first chunk of each array is always
+    empty, so that empty arrays are yielded too. If ijson is installed the file is parsed
+    incrementally and fields are yielded in file order, otherwise the file is read
+    in one go and the `stream_keys` are yielded last.
+
+    Args:
+        path: json file
+        stream_keys (typing.Iterable, optional): keys of arrays to yield in chunks.
+        chunk_size (int, optional): size of the first chunk. Defaults to 100.
+        max_chunk_size (int, optional): Defaults to 10000.
+    """
+    stream_keys = set(stream_keys)
+
+    def chunk_sizes():
+        return (min(chunk_size * 2 ** n, max_chunk_size) for n in itertools.count())
+
+    if not check_installed("ijson"):
+        data = loads(pathlib.Path(path).read_bytes())
+        for k, v in data.items():
+            if k not in stream_keys:
+                yield k, v
+        for k in stream_keys & data.keys():
+            if not isinstance(data[k], list):
+                yield k, data[k]
+                continue
+            yield k, []  # the array is in the file, even if it is empty
+            n = 0
+            for size in chunk_sizes():
+                if n >= len(data[k]):
+                    break
+                yield k, data[k][n : n + size]
+                n += size
+        return
+
+    with open(path, "rb") as f:
+        key, builder, rows = None, None, []
+        sizes, size = None, None  # set whilst the array of a stream key is read
+        for prefix, event, v in ijson.parse(f, use_float=True):
+            if prefix == "":
+                if event == "map_key":
+                    key = v
+            elif key in stream_keys and prefix == key and event == "start_array":
+                sizes = chunk_sizes()
+                size = next(sizes)
+                yield key, []  # the array is in the file, even if it is empty
+            elif sizes is not None and prefix == key and event == "end_array":
+                if rows:
+                    yield key, rows
+                    rows = []
+                sizes, size = None, None
+            elif sizes is not None:
+                item = key + ".item"
+                if builder is None and prefix == item:
+                    if event in ("start_map", "start_array"):
+                        builder = ijson.ObjectBuilder()
+                    else:
+                        rows.append(v)  # row is a scalar
+                if builder is not None:
+                    builder.event(event, v)
+                    if prefix == item and event in ("end_map", "end_array"):
+                        rows.append(builder.value)
+                        builder = None
+                if len(rows) == size:
+                    yield key, rows
+                    rows, size = [], next(sizes)
+            elif builder is None:  # incl. a stream key that isn't an array
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, v)
+                else:
+                    yield key, v
+            else:
+                builder.event(event, v)
+                if prefix == key and event in ("end_map", "end_array"):
+                    yield key, builder.value
+                    builder = None
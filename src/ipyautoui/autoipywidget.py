@@ -31,6 +31,7 @@ Example:
 # %load_ext lab_black
 import logging
 import functools
+import contextlib
 import ipywidgets as widgets
 from IPython.display import display
 import traitlets
@@ -42,6 +43,7 @@ from ipyautoui.constants import load_test_constants, DOWNARROW_BUTTON_KWARGS
 
 from ipyautoui.custom.showhide import ShowHide
 import ipyautoui.automapschema as aumap
+from ipyautoui._utils import parse_update_policy, Debouncer
 import immutables
 import inspect
 
@@ -49,23 +51,95 @@ frozenmap = immutables.Map
 
 
 # +
+class LazyWidget(traitlets.HasTraits):
+    """placeholder for a nested widget that is only built when it is first displayed
+    (see `horizontal_row_nested`). until then "value" is kept as plain data."""
+
+    _value = traitlets.Any(allow_none=True)
+
+    def __init__(self, caller: aumap.WidgetCaller):
+        self.caller = caller
+        self.widget = None
+        self._disabled = False
+        self._value = aumap.get_default(self.caller.schema_)
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if self.widget is None:
+            if value is None:
+                value = aumap.get_default(self.caller.schema_)
+            self._value = value
+        else:
+            if value is None:
+                value = _get_value_trait(self.widget).default()
+            self.widget.value = value
+
+    @property
+    def disabled(self):
+        return self._disabled
+
+    @disabled.setter
+    def disabled(self, value):
+        self._disabled = value
+        if self.widget is not None:
+            self.widget.disabled = value
+
+    @property
+    def is_built(self):
+        return self.widget is not None
+
+    def build(self):
+        """builds the widget (once) and returns it"""
+        if self.widget is None:
+            self.widget = aumap.widgetcaller(self.caller)
+            if self._value is not None:
+                self.widget.value = self._value
+            if self._disabled:
+                try:
+                    self.widget.disabled = True
+                except:
+                    pass
+            if self.widget.has_trait("value"):
+                self.widget.observe(self._update_value, "value")
+            elif self.widget.has_trait("_value"):
+                self.widget.observe(self._update_value, "_value")
+            self._value = self.widget.value
+        return self.widget
+
+    def _update_value(self, change):
+        self._value = self.widget.value
+
+    def flush_updates(self):
+        if self.widget is not None and hasattr(self.widget, "flush_updates"):
+            self.widget.flush_updates()
+
+
 def _init_widgets_and_labels(
-    pr: typing.Dict,
+    pr: typing.Dict, lazy: typing.List = None
 ) -> tuple((typing.List[widgets.HBox], typing.Dict)):
     """initiates widget for from dict built from schema
 
     Args:
         pr (typing.Dict): schema properties - sanitised for ipywidgets
+        lazy (typing.List, optional): keys of pr where a `LazyWidget` is created
+            instead of the widget. Defaults to None.
 
     Returns:
         (widgets.VBox, typing.Dict): box with widgets, di of widgets
     """
-
-    _init_widget = lambda v: aumap.widgetcaller(v)
+    if lazy is None:
+        lazy = []
+    _init_widget = (
+        lambda k, v: LazyWidget(v) if k in lazy else aumap.widgetcaller(v)
+    )
     _make_label = lambda title, description: f"<b>{title}</b>, <i>{description}</i>"
     _get = lambda schema, var: schema[var] if var in schema.keys() else ""
 
-    di_widgets = {k: _init_widget(v) for k, v in pr.items()}
+    di_widgets = {k: _init_widget(k, v) for k, v in pr.items()}
     di_labels = {
         k: _make_label(_get(v.schema_, "title"), _get(v.schema_, "description"))
         for k, v in pr.items()
@@ -75,17 +149,10 @@ def _init_widgets_and_labels(
 
 
 def _init_model_schema(schema, by_alias=False):
-    if type(schema) == dict:
-        model = None  # jsonschema_to_pydantic(schema)
-        # IDEA: Possible implementations -@jovyan at 8/24/2022, 12:05:02 PM
-        # jsonschema_to_pydantic
-        # https://koxudaxi.github.io/datamodel-code-generator/using_as_module/
-    else:
-        model = schema  # the "model" passed is a pydantic model
-        schema = model.schema(by_alias=by_alias).copy()
-
-    schema = aumap.attach_schema_refs(schema)
-    return model, schema
+    # IDEA: Possible implementations -@jovyan at 8/24/2022, 12:05:02 PM
+    # jsonschema_to_pydantic for dict schemas (model is None)
+    # https://koxudaxi.github.io/datamodel-code-generator/using_as_module/
+    return aumap.resolve_schema(schema, by_alias=by_alias)
 
 
 # + tags=[]
@@ -139,12 +206,34 @@ def add_fdir_to_widgetcaller(caller, fdir: str):  #: aumap.WidgetCaller
         raise ValueError(f"ERROR add_fdir_to_widgetcallers self.fdir = {fdir}")
 
 
+def add_kwargs_to_widgetcaller(caller, **kwargs):
+    """adds kwargs to the caller if they are args of the widget being called
+
+    Example:
+        >>> import ipyautoui.automapschema as aumap
+        >>> from ipyautoui.autowidgets import Text
+        >>> caller = aumap.WidgetCaller(schema_={'title': 'Test', 'type': 'string'}, autoui=Text)
+        >>> add_kwargs_to_widgetcaller(caller, lazy_nested=True).kwargs
+        {}
+    """
+    args = inspect.getfullargspec(caller.autoui).args
+    caller.kwargs = {
+        **caller.kwargs,
+        **{k: v for k, v in kwargs.items() if k in args},
+    }
+    return caller
+
+
 def horizontal_row_nested(widget, label, auto_open=False):
     # BUG: Reported defects -@jovyan at 8/23/2022, 10:30:52 PM
     # ^ buggy behaviour associated to ShowHide class for nested objects observed in
     # example form linked to `horizontal_row_nested`
+    if isinstance(widget, LazyWidget):
+        fn_display = widget.build  # nested widget is built when first shown
+    else:
+        fn_display = lambda: widget
     return ShowHide(
-        fn_display=lambda: widget,
+        fn_display=fn_display,
         title=label,
         auto_open=auto_open,
         button_width="300px",
@@ -182,11 +271,15 @@ def create_row(
     if nested_widgets is None:
         nested_widgets = []
     if align_horizontal:
-        if True in [isinstance(widget, w) for w in nested_widgets]:
+        if isinstance(widget, LazyWidget) or True in [
+            isinstance(widget, w) for w in nested_widgets
+        ]:
             return horizontal_row_nested(widget, label, auto_open=auto_open)
         else:
             return horizontal_row_simple(widget, label)
     else:
+        if isinstance(widget, LazyWidget):
+            widget = widget.build()
         return vertical_row(widget, label)
 
 
@@ -200,6 +293,16 @@ class AutoObject(widgets.VBox):
     nested_widgets = traitlets.List()
     order = traitlets.List(default_value=None, allow_none=True)
     insert_rows = traitlets.Dict(default_value=None, allow_none=True)
+    lazy_nested = traitlets.Bool(default_value=False)
+    value_change = traitlets.Dict(default_value=None, allow_none=True)
+    #  ^ last change made to the value. {"path": [keys, ...], "old": .., "new": ..}
+    update_policy = traitlets.Unicode(default_value=None, allow_none=True)
+    _holding_changes = False  # True whilst value is being set in bulk
+
+    @traitlets.validate("update_policy")
+    def _valid_update_policy(self, proposal):
+        parse_update_policy(proposal["value"])  # raises ValueError if not valid
+        return proposal["value"]
 
     @traitlets.validate("insert_rows")
     def _insert_rows(self, proposal):
@@ -264,9 +367,12 @@ class AutoObject(widgets.VBox):
     @value.setter
     def value(self, value):
         """this is for setting the value via the API"""
-        self._value = value
+        old = self._value
         if hasattr(self, "di_widgets"):
-            self._update_widgets_from_value()
+            self._update_widgets_from_value(value)
+        else:
+            self._value = value
+        self.value_change = {"path": [], "old": old, "new": self._value}
 
     def __init__(
         self,
@@ -278,6 +384,8 @@ class AutoObject(widgets.VBox):
         order=None,
         insert_rows=None,
         nested_widgets=None,
+        lazy_nested=False,
+        update_policy=None,
     ):
         """creates a widget input form from schema. datatype must be "object"
 
@@ -291,11 +399,18 @@ class AutoObject(widgets.VBox):
                 is ignored by the widget otherwise.
             nested_widgets (list): e.g. [FileUploadToDir]. allows user to indicate widgets that should be show / hide
                 type
+            lazy_nested (bool): if True nested widgets (e.g. objects and arrays) are only built when first
+                expanded. until then their value is kept as plain data. Defaults to False.
+            update_policy (str): default "update_policy" of text-like widgets in the form. e.g.
+                "on_blur" or "debounce:300ms". see `ipyautoui._utils.parse_update_policy`. text-like
+                widgets can also set their own `update_policy` in the schema. Defaults to None.
 
         Returns:
             AutoIpywidget(widgets.VBox)
         """
         setdefault = lambda val, default: default if val is None else val
+        self.lazy_nested = lazy_nested
+        self.update_policy = update_policy
         self.insert_rows = insert_rows
         self.update_map_widgets = update_map_widgets
         self.fdir = fdir
@@ -323,11 +438,30 @@ class AutoObject(widgets.VBox):
         if self.fdir is not None:
             for v in self.pr.values():
                 v = add_fdir_to_widgetcaller(v, self.fdir)
+        if self.lazy_nested:
+            for v in self.pr.values():
+                v = add_kwargs_to_widgetcaller(v, lazy_nested=True)
+        if self.update_policy is not None:
+            for v in self.pr.values():
+                v = add_kwargs_to_widgetcaller(v, update_policy=self.update_policy)
+
+    @property
+    def lazy_keys(self):
+        """keys of nested widgets that are only built when first expanded"""
+        if not self.lazy_nested or not self.align_horizontal:
+            return []
+        nested = tuple(self.nested_widgets)
+        return [
+            k
+            for k, v in self.pr.items()
+            if inspect.isclass(v.autoui) and issubclass(v.autoui, nested)
+        ]
 
     def _init_widgets(self):
-        self.di_labels, self.di_widgets = _init_widgets_and_labels(self.pr)
-        self._value = self.di_widgets_value
-        self._update_widgets_from_value()
+        self.di_labels, self.di_widgets = _init_widgets_and_labels(
+            self.pr, lazy=self.lazy_keys
+        )
+        self._update_widgets_from_value(self.di_widgets_value)
 
     def _init_form(self):
         super().__init__(
@@ -365,19 +499,47 @@ class AutoObject(widgets.VBox):
         self._init_update_row_format()
 
     def _init_watch_widgets(self):
+        self._debouncers = {}
         for k, v in self.di_widgets.items():
-            if v.has_trait("value"):
+            if v.has_trait("value_change"):
                 v.observe(
-                    functools.partial(self._watch_change, key=k, watch="value"), "value"
+                    functools.partial(self._watch_nested_change, key=k),
+                    "value_change",
                 )
-            elif v.has_trait("_value"):
+            elif v.has_trait("value"):
+                v.observe(self._get_watch_change(k, v, watch="value"), "value")
+            elif v.has_trait("value_version"):  # e.g. EditGrid
                 v.observe(
-                    functools.partial(self._watch_change, key=k, watch="_value"),
-                    "_value",
+                    self._get_watch_change(k, v, watch="value_version"),
+                    "value_version",
                 )
+            elif v.has_trait("_value"):
+                v.observe(self._get_watch_change(k, v, watch="_value"), "_value")
             else:
                 pass
 
+    def _get_watch_change(self, key, widget, watch="value"):
+        """returns the observer for a widget. if the widget is text-like (has an
+        "update_policy") and the policy is "debounce" the observer is debounced."""
+        fn = functools.partial(self._watch_change, key=key, watch=watch)
+        if not hasattr(widget, "update_policy"):
+            return fn
+        if widget.update_policy is None and self.update_policy is not None:
+            widget.update_policy = self.update_policy
+        mode, wait = parse_update_policy(widget.update_policy)
+        if mode == "debounce":
+            fn = Debouncer(fn, wait=wait)
+            self._debouncers[key] = fn
+        return fn
+
+    def flush_updates(self):
+        """propagates any pending (debounced) edits now. e.g. call before saving"""
+        for v in self.di_widgets.values():
+            if hasattr(v, "flush_updates"):
+                v.flush_updates()
+        for v in self._debouncers.values():
+            v.flush()
+
     def _call_format_rows(self, onchange):
         self._format_rows()
 
@@ -394,12 +556,61 @@ class AutoObject(widgets.VBox):
         )
 
     def _watch_change(self, change, key=None, watch="value"):
-        self._value = self.di_widgets_value
+        if self._holding_changes:
+            return
+        old = self._value.get(key) if self._value is not None else None
+        # ^ not change["old"] as debounced changes are collapsed into one
+        new = self.di_widgets[key].value if watch == "value_version" else change["new"]
+        self._patch_value(key, path=[key], old=old, new=new)
+
+    def _watch_nested_change(self, change, key=None):
+        """a nested AutoObject has changed. its path is prefixed with key"""
+        nested_change = change["new"]
+        if nested_change is None or self._holding_changes:
+            return
+        self._patch_value(
+            key,
+            path=[key] + list(nested_change["path"]),
+            old=nested_change["old"],
+            new=nested_change["new"],
+        )
+
+    def _patch_value(self, key, path=None, old=None, new=None):
+        """updates only the changed key of "_value" and then emits "value_change".
+        the cost is O(depth) shallow dict copies rather than re-reading every widget.
+        """
+        _value = dict(self._value) if self._value is not None else {}
+        _value[key] = self.di_widgets[key].value
+        self._value = _value
         # NOTE: it is required to set the whole "_value" otherwise
         # traitlets doesn't register the change. -@jovyan at 7/18/2022, 12:45:48 PM
+        self.value_change = {"path": path, "old": old, "new": new}
 
-    def _update_widgets_from_value(self):
-        for k, v in self.value.items():
+    def _update_widgets_from_value(self, value):
+        """sets the value of every widget as a single batch. child observers are
+        suspended and front-end syncs held whilst the values are set, such that
+        "_value" is rebuilt (and "_value" changes) once rather than once per widget.
+        pending (debounced) edits are discarded as they are superseded by value.
+        """
+        self._holding_changes = True
+        try:
+            with contextlib.ExitStack() as stack:
+                for w in self.di_widgets.values():
+                    if isinstance(w, widgets.Widget):
+                        stack.enter_context(w.hold_sync())
+                self._set_widget_values(value)
+            self._discard_updates()  # incl. the calls made by setting the values above
+        finally:
+            self._holding_changes = False
+        self._rebuild_value(value)
+
+    def _discard_updates(self):
+        """drops pending (debounced) edits, e.g. when superseded by setting the value"""
+        for v in getattr(self, "_debouncers", {}).values():  # none until watched
+            v.discard()
+
+    def _set_widget_values(self, value: dict):
+        for k, v in value.items():
             if k in self.di_widgets.keys():
                 if v is None:
                     v = _get_value_trait(self.di_widgets[k]).default()
@@ -409,6 +620,13 @@ class AutoObject(widgets.VBox):
                     f"no widget created for {k}, with value {str(v)}. fix this in the schema! TODO: fix the schema reader and UI to support nesting. or use ipyvuetify"
                 )
 
+    def _rebuild_value(self, value: dict):
+        """sets "_value" from the widgets for the keys of value"""
+        self._value = {
+            k: self.di_widgets[k].value if k in self.di_widgets else v
+            for k, v in value.items()
+        }
+
     @property
     def di_widgets_value(self):
         return {k: v.value for k, v in self.di_widgets.items()}
@@ -435,14 +653,26 @@ class AutoIpywidget(widgets.VBox):
     """Automatically generates the widget based on an input schema"""
 
     fdir = traitlets.Unicode(allow_none=True)
+    lazy_nested = traitlets.Bool(default_value=False)
+    update_policy = traitlets.Unicode(default_value=None, allow_none=True)
     # TODO: Tasks pending completion -@jovyan at 7/18/2022, 2:06:04 PM
     # consider changing name `update_map_widgets` to `update_widgets_mapper`
 
     # TODO: Tasks pending completion -@jovyan at 9/07/2022, 2:06:04 PM
     # consider whether this shouldn't inherit AutoObject afterall...
-    def __init__(self, schema, value=None, update_map_widgets=None, fdir=None):
+    def __init__(
+        self,
+        schema,
+        value=None,
+        update_map_widgets=None,
+        fdir=None,
+        lazy_nested=False,
+        update_policy=None,
+    ):
         self.update_map_widgets = update_map_widgets
         self.fdir = fdir
+        self.lazy_nested = lazy_nested
+        self.update_policy = update_policy
         self._init_ui(schema)
         if value is not None:
             self.value = value
@@ -475,6 +705,12 @@ class AutoIpywidget(widgets.VBox):
         self.caller = aumap.map_widget(self.schema, widgets_map=self.widgets_map)
         if self.fdir is not None:
             v = add_fdir_to_widgetcaller(caller=self.caller, fdir=self.fdir)
+        if self.lazy_nested:
+            v = add_kwargs_to_widgetcaller(self.caller, lazy_nested=True)
+        if self.update_policy is not None:
+            v = add_kwargs_to_widgetcaller(
+                self.caller, update_policy=self.update_policy
+            )
 
     def _init_form(self):
         super().__init__(
@@ -494,6 +730,11 @@ class AutoIpywidget(widgets.VBox):
     def _on_change(self, change):
         self._value = self.autowidget.value
 
+    def flush_updates(self):
+        """propagates any pending (debounced) edits now"""
+        if hasattr(self.autowidget, "flush_updates"):
+            self.autowidget.flush_updates()
+
     @property
     def value(self):
         return self._value
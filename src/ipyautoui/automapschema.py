@@ -17,6 +17,8 @@
 # %run __init__.py
 # %load_ext lab_black
 import typing
+import functools
+import collections
 from pydantic import BaseModel, Field
 from ipywidgets import widgets
 import ipywidgets as widgets
@@ -104,6 +106,74 @@ def attach_schema_refs(schema, schema_base=None):
     return schema
 
 
+#  -- CACHE RESOLVED SCHEMAS --------------------------------
+SCHEMA_CACHE_MAXSIZE = 256
+_SCHEMA_CACHE = collections.OrderedDict()
+#  ^ LRU cache of resolved schemas. keys are (model, by_alias) for pydantic models
+#    and the id() of dict schemas. a dict schema is cached with the dict itself,
+#    which keeps it alive (so its id can't be reused) and is checked by identity.
+
+
+def _schema_cache_key(schema, by_alias=False):
+    if type(schema) == dict:
+        return ("dict", id(schema))
+    key = ("model", schema, by_alias)
+    try:
+        hash(key)
+    except TypeError:
+        return None  # e.g. pydantic model instances are unhashable
+    return key
+
+
+def clear_schema_cache():
+    """clears the process-wide resolved schema cache"""
+    _SCHEMA_CACHE.clear()
+
+
+def resolve_schema(schema, by_alias=False):
+    """returns the pydantic model (or None) and the schema with $refs attached.
+    results are cached (LRU) so that building many forms from the same model only
+    resolves the schema once. dict schemas are cached by identity, so a dict must
+    not be edited in-place once it has been resolved.
+
+    Args:
+        schema (typing.Union[dict, pydantic.BaseModel]): json schema or pydantic model
+        by_alias (bool, optional): passed to `model.schema`. Defaults to False.
+
+    Returns:
+        (typing.Type[BaseModel], dict): model, resolved schema. the returned schema is a
+            shallow copy of the cached schema; nested objects are shared and must not be
+            edited in-place.
+
+    Example:
+        >>> from ipyautoui.test_schema import TestAutoLogicSimple
+        >>> model, schema = resolve_schema(TestAutoLogicSimple)
+        >>> resolve_schema(TestAutoLogicSimple)[1]["properties"] is schema["properties"]
+        True
+    """
+    if type(schema) == dict:
+        model = None
+    else:
+        model = schema  # the "model" passed is a pydantic model
+    key = _schema_cache_key(schema, by_alias=by_alias)
+    if key is not None and key in _SCHEMA_CACHE:
+        source, resolved = _SCHEMA_CACHE[key]
+        if source is schema:
+            _SCHEMA_CACHE.move_to_end(key)
+            return model, resolved.copy()
+
+    if model is not None:
+        resolved = attach_schema_refs(model.schema(by_alias=by_alias).copy())
+    else:
+        resolved = attach_schema_refs(schema)
+
+    if key is not None:
+        _SCHEMA_CACHE[key] = (schema, resolved)
+        if len(_SCHEMA_CACHE) > SCHEMA_CACHE_MAXSIZE:
+            _SCHEMA_CACHE.popitem(last=False)
+    return model, resolved.copy()
+
+
 #  ----------------------------------------------------------
 # -
 
@@ -435,6 +505,11 @@ class WidgetMapper(BaseModel):
 
     fn_filt: typing.Callable
     widget: typing.Callable
+    types: typing.Optional[typing.List[str]] = Field(
+        None,
+        description="json-schema types that fn_filt can match. used to index the "
+        "mapper in the WidgetDispatcher. None == matches any type",
+    )
 
 
 class WidgetCaller(BaseModel):
@@ -493,45 +568,66 @@ def update_widgets_map(widgets_map, di_update=None):
     return _
 
 
-def widgets_map(di_update=None):
-
+@functools.lru_cache(maxsize=None)
+def _default_widgets_map():
+    """builds the default widgets_map. called once."""
     WIDGETS_MAP = frozenmap(
         **{
             "AutoOveride": WidgetMapper(
                 fn_filt=is_AutoOveride, widget=auiwidgets.AutoPlaceholder,
             ),
-            "IntText": WidgetMapper(fn_filt=is_IntText, widget=auiwidgets.IntText),
+            "IntText": WidgetMapper(
+                fn_filt=is_IntText, widget=auiwidgets.IntText, types=["integer"]
+            ),
             "IntSlider": WidgetMapper(
-                fn_filt=is_IntSlider, widget=auiwidgets.IntSlider
+                fn_filt=is_IntSlider, widget=auiwidgets.IntSlider, types=["integer"]
             ),
             "FloatText": WidgetMapper(
-                fn_filt=is_FloatText, widget=auiwidgets.FloatText
+                fn_filt=is_FloatText, widget=auiwidgets.FloatText, types=["number"]
             ),
             "FloatSlider": WidgetMapper(
-                fn_filt=is_FloatSlider, widget=auiwidgets.IntSlider
+                fn_filt=is_FloatSlider, widget=auiwidgets.IntSlider, types=["number"]
             ),
             "IntRangeSlider": WidgetMapper(
-                fn_filt=is_IntRangeSlider, widget=auiwidgets.IntRangeSlider
+                fn_filt=is_IntRangeSlider,
+                widget=auiwidgets.IntRangeSlider,
+                types=["array"],
             ),
             "FloatRangeSlider": WidgetMapper(
-                fn_filt=is_FloatRangeSlider, widget=auiwidgets.FloatRangeSlider
+                fn_filt=is_FloatRangeSlider,
+                widget=auiwidgets.FloatRangeSlider,
+                types=["array"],
+            ),
+            "Text": WidgetMapper(
+                fn_filt=is_Text, widget=auiwidgets.Text, types=["string"]
+            ),
+            "Textarea": WidgetMapper(
+                fn_filt=is_Textarea, widget=auiwidgets.Textarea, types=["string"]
             ),
-            "Text": WidgetMapper(fn_filt=is_Text, widget=auiwidgets.Text),
-            "Textarea": WidgetMapper(fn_filt=is_Textarea, widget=auiwidgets.Textarea),
             "Markdown": WidgetMapper(
-                fn_filt=is_Markdown, widget=auiwidgets.AutoMarkdown
+                fn_filt=is_Markdown, widget=auiwidgets.AutoMarkdown, types=["string"]
             ),
             "Dropdown": WidgetMapper(fn_filt=is_Dropdown, widget=auiwidgets.Dropdown),
             "SelectMultiple": WidgetMapper(
-                fn_filt=is_SelectMultiple, widget=auiwidgets.SelectMultiple
+                fn_filt=is_SelectMultiple,
+                widget=auiwidgets.SelectMultiple,
+                types=["array"],
+            ),
+            "Checkbox": WidgetMapper(
+                fn_filt=is_Checkbox, widget=auiwidgets.Checkbox, types=["boolean"]
+            ),
+            "Date": WidgetMapper(
+                fn_filt=is_Date, widget=auiwidgets.DatePickerString, types=["string"]
+            ),
+            "Color": WidgetMapper(
+                fn_filt=is_Color, widget=auiwidgets.ColorPicker, types=["string"]
             ),
-            "Checkbox": WidgetMapper(fn_filt=is_Checkbox, widget=auiwidgets.Checkbox),
-            "Date": WidgetMapper(fn_filt=is_Date, widget=auiwidgets.DatePickerString),
-            "Color": WidgetMapper(fn_filt=is_Color, widget=auiwidgets.ColorPicker),
             "object": WidgetMapper(
-                fn_filt=is_Object, widget=auiwidgets.AutoPlaceholder
+                fn_filt=is_Object, widget=auiwidgets.AutoPlaceholder, types=["object"]
+            ),
+            "array": WidgetMapper(
+                fn_filt=is_Array, widget=auiwidgets.AutoPlaceholder, types=["array"]
             ),
-            "array": WidgetMapper(fn_filt=is_Array, widget=auiwidgets.AutoPlaceholder),
             "DataFrame": WidgetMapper(
                 fn_filt=is_DataFrame, widget=auiwidgets.AutoPlaceholder
             ),
@@ -542,15 +638,91 @@ def widgets_map(di_update=None):
     from ipyautoui.custom.editgrid import EditGrid
 
     di_update_ = {
-        "array": WidgetMapper(fn_filt=is_Array, widget=AutoArray),
+        "array": WidgetMapper(fn_filt=is_Array, widget=AutoArray, types=["array"]),
         "DataFrame": WidgetMapper(fn_filt=is_DataFrame, widget=EditGrid),
-        "object": WidgetMapper(fn_filt=is_Object, widget=AutoObject),
+        "object": WidgetMapper(
+            fn_filt=is_Object, widget=AutoObject, types=["object"]
+        ),
     }
-    if di_update is not None:
-        di_update = {**di_update_, **di_update}
+    return update_widgets_map(WIDGETS_MAP, di_update=di_update_)
+
+
+WIDGETS_MAPS_MAXSIZE = 32
+_WIDGETS_MAPS = collections.OrderedDict()
+#  ^ memoized widgets_maps (LRU). keyed on the content of di_update
+
+
+def clear_widgets_map_cache():
+    """clears the process-wide memoized widgets_maps and their dispatchers"""
+    _WIDGETS_MAPS.clear()
+    _DISPATCHERS.clear()
+
+
+def _widgets_map_key(di_update):
+    if di_update is None:
+        return None
+    try:
+        key = tuple(
+            (k, v.fn_filt, v.widget, None if v.types is None else tuple(v.types))
+            for k, v in sorted(di_update.items(), key=lambda x: x[0])
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        return ()  # not cacheable
+    return key
+
+
+def widgets_map(di_update=None):
+    """returns the frozen map of WidgetMappers used to map schema fragments to widgets.
+    the default map is updated with `di_update` if given. results are memoized on the
+    content of `di_update` such that all widgets in a form (including nested objects and
+    array rows) share one mapping.
+
+    Args:
+        di_update (dict of WidgetMappers, optional): updates to the default map.
+            Defaults to None.
+
+    Returns:
+        frozenmap: of WidgetMappers
+
+    Example:
+        >>> widgets_map() is widgets_map()
+        True
+    """
+    key = _widgets_map_key(di_update)
+    if key != () and key in _WIDGETS_MAPS:
+        _WIDGETS_MAPS.move_to_end(key)
+        return _WIDGETS_MAPS[key]
+    if di_update is None:
+        _map = _default_widgets_map()
+    else:
+        _map = update_widgets_map(_default_widgets_map(), di_update=di_update)
+    if key != ():
+        _WIDGETS_MAPS[key] = _map
+        if len(_WIDGETS_MAPS) > WIDGETS_MAPS_MAXSIZE:
+            _WIDGETS_MAPS.popitem(last=False)
+    return _map
+
+
+def get_default(schema: typing.Dict):
+    """gets the default value from a schema fragment without building a widget.
+    nested objects are built up from the defaults of their properties.
+
+    Example:
+        >>> get_default({"type": "object", "properties": {"a": {"type": "string", "default": "b"}}})
+        {'a': 'b'}
+        >>> get_default({"type": "array", "items": {"type": "string"}})
+        []
+    """
+    if "default" in schema.keys():
+        return schema["default"]
+    t = schema.get("type")
+    if t == "object" and "properties" in schema.keys():
+        return {k: get_default(v) for k, v in schema["properties"].items()}
+    elif t == "array":
+        return []
     else:
-        di_update = di_update_
-    return update_widgets_map(WIDGETS_MAP, di_update=di_update)
+        return None
 
 
 def get_autooveride(schema):
@@ -562,6 +734,74 @@ def get_autooveride(schema):
     return cl
 
 
+class WidgetDispatcher:
+    """compiled lookup for a widgets_map. mappers are indexed by the json-schema "type"
+    they can match (see `WidgetMapper.types`) such that only the relevant "fn_filt"
+    predicates are evaluated for a given schema fragment. the result is memoized per
+    schema fragment (by identity - resolved schemas are shared, see `resolve_schema`).
+
+    Example:
+        >>> dispatcher = WidgetDispatcher(widgets_map())
+        >>> dispatcher.match({"title": "Int Text", "default": 1, "type": "integer"})
+        ['IntText']
+    """
+
+    MEMO_MAXSIZE = 2048
+
+    def __init__(self, widgets_map):
+        self.widgets_map = widgets_map
+        self.keys = list(widgets_map.keys())
+        # ^ preserves iteration order of widgets_map, which decides the "last match"
+        li_types = set(
+            t for v in widgets_map.values() if v.types is not None for t in v.types
+        )
+        self.untyped = [k for k in self.keys if widgets_map[k].types is None]
+        self.by_type = {
+            t: [
+                k
+                for k in self.keys
+                if widgets_map[k].types is None or t in widgets_map[k].types
+            ]
+            for t in li_types
+        }
+        self._memo = collections.OrderedDict()
+
+    def candidates(self, di):
+        t = di.get("type")
+        if not isinstance(t, str):
+            return self.keys  # e.g. no type or list of types. check all mappers
+        return self.by_type.get(t, self.untyped)
+
+    def match(self, di) -> typing.List[str]:
+        """returns the keys of the widgets_map that match the schema fragment"""
+        memo = self._memo.get(id(di))
+        if memo is not None and memo[0] is di:
+            return memo[1]
+        mapped = [k for k in self.candidates(di) if self.widgets_map[k].fn_filt(di)]
+        self._memo[id(di)] = (di, mapped)
+        # ^ the fragment is stored to stop its id being reused whilst memoized
+        if len(self._memo) > self.MEMO_MAXSIZE:
+            self._memo.popitem(last=False)
+        return mapped
+
+
+DISPATCHERS_MAXSIZE = 32
+_DISPATCHERS = collections.OrderedDict()
+#  ^ compiled WidgetDispatchers (LRU). keyed on the id() of the widgets_map
+
+
+def get_dispatcher(widgets_map) -> WidgetDispatcher:
+    """returns the compiled WidgetDispatcher for a given widgets_map"""
+    dispatcher = _DISPATCHERS.get(id(widgets_map))
+    if dispatcher is not None and dispatcher.widgets_map is widgets_map:
+        return dispatcher
+    dispatcher = WidgetDispatcher(widgets_map)
+    _DISPATCHERS[id(widgets_map)] = dispatcher
+    if len(_DISPATCHERS) > DISPATCHERS_MAXSIZE:
+        _DISPATCHERS.popitem(last=False)
+    return dispatcher
+
+
 def map_widget(di, widgets_map=None, fail_on_error=False) -> WidgetCaller:
     if widgets_map is None:
         widgets_map = widgets_map()
@@ -572,11 +812,7 @@ def map_widget(di, widgets_map=None, fail_on_error=False) -> WidgetCaller:
         else:
             return widgets_map[k].widget
 
-    mapped = []
-    # loop through widgets_map to find a correct mapping...
-    for k, v in widgets_map.items():
-        if v.fn_filt(di):
-            mapped.append(k)
+    mapped = get_dispatcher(widgets_map).match(di)
 
     if len(mapped) == 0:
         if fail_on_error:
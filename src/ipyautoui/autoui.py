@@ -36,16 +36,29 @@ import pathlib
 import functools
 import ipywidgets as widgets
 from IPython.display import display, Markdown, clear_output, display_pretty
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
 from markdown import markdown
 import immutables
-import json
 import traitlets
 import traitlets_paths
 import typing
+import concurrent.futures
+import asyncio
 from enum import Enum
-
-from ipyautoui._utils import display_python_string
+from datetime import datetime
+
+from ipyautoui._utils import (
+    display_python_string,
+    write_text_atomic,
+    WriteBehindQueue,
+    dumps,
+    loads,
+    model_dumps,
+    iter_json_file,
+    Throttler,
+)
 from ipyautoui.custom import SaveButtonBar  #  Grid, FileChooser,
 from ipyautoui.constants import BUTTON_WIDTH_MIN
 from ipyautoui.autoipywidget import AutoIpywidget, _init_model_schema
@@ -92,10 +105,35 @@ def rename_vjsf_schema_keys(obj, old="x_", new="x-"):
 def parse_json_file(path: pathlib.Path, model=None):
     """read json from file"""
     p = pathlib.Path(path)
+    data = loads(p.read_bytes())
     if model is not None:
-        return json.loads(model.parse_file(p).json())
+        return loads(model_dumps(model.parse_obj(data), indent=None))
     else:
-        return json.loads(p.read_text())
+        return data
+
+
+def validate_json_field(model, key: str, value):
+    """validate the value of a single field of model, returning it as json data.
+    as the other fields are not given, validators that depend on them are not run.
+    if the field is missing (value is None) its default is returned.
+
+    Args:
+        model (pydantic.BaseModel): model containing the field. if None, or the field
+            is not in the model, the value is returned unchanged.
+        key (str): field name
+        value: json data
+    """
+    if model is None or key not in model.__fields__:
+        return value
+    field = model.__fields__[key]
+    if value is None and not field.allow_none:
+        if field.required:
+            raise ValidationError([ErrorWrapper(MissingError(), loc=key)], model)
+        value = field.get_default()
+    v, errors = field.validate(value, {}, loc=key, cls=model)
+    if errors:
+        raise ValidationError([errors], model)
+    return loads(dumps(v, indent=None, default=model.__json_encoder__))
 
 
 # +
@@ -137,6 +175,12 @@ class AutoUiCommonMethods(traitlets.HasTraits):
     path = traitlets_paths.Path(allow_none=True)
     show_raw = traitlets.Bool(default_value=True)
     show_description = traitlets.Bool(default_value=True)
+    write_behind = traitlets.Bool(default_value=False)
+    # ^ if True files are written in a background thread. see `file`
+    autosave_wait = traitlets.Float(default_value=2.0)
+    # ^ with save_on_edit, the minimum interval (seconds) between saves
+    compact_json = traitlets.Bool(default_value=False)
+    # ^ if True json is written without indentation (smaller and faster)
 
     @traitlets.validate("path")
     def _path(self, proposal):
@@ -145,6 +189,7 @@ class AutoUiCommonMethods(traitlets.HasTraits):
 
     @traitlets.validate("save_controls")
     def _save_controls(self, proposal):
+        self._stop_autosave()  # the new mode may not save on edit
         if self.path is not None:
             map_save_dialogue = immutables.Map(
                 save_buttonbar=self.call_save_buttonbar,  # only this one currently works
@@ -159,10 +204,14 @@ class AutoUiCommonMethods(traitlets.HasTraits):
 
     @property
     def json(self):
+        return self._get_json(self.value)
+
+    def _get_json(self, value):
+        indent = None if self.compact_json else 4
         if self.model is not None:
-            return self.model(**self.value).json(indent=4)
+            return model_dumps(self.model(**value), indent=indent)
         else:
-            return json.dumps(self.value, indent=4)
+            return dumps(value, indent=indent)
 
     def _init_AutoUiCommonMethods(self):
         self._init_autoui_form()
@@ -289,23 +338,133 @@ class AutoUiCommonMethods(traitlets.HasTraits):
             raise ValueError("_get_value error...?")
 
     def file(self, path=None):
+        """write the value to file. the write is atomic (temp file + rename).
+        if write_behind, the json is serialized and written in a background thread
+        and a Future is returned; saves queued before the previous one is written are
+        coalesced and completion is reported to save_buttonbar.message."""
+        if hasattr(self, "flush_updates"):
+            self.flush_updates()  # include any pending (debounced) edits
         p = self._get_path(path=path)
-        p.write_text(self.json, encoding="utf-8")
+        if self.write_behind:
+            if getattr(self, "_write_queue", None) is None:
+                self._write_queue = WriteBehindQueue(on_done=self._on_file_written)
+            return self._write_queue.put(
+                p, functools.partial(self._get_json, self.value)
+            )
+        write_text_atomic(p, self.json, encoding="utf-8")
+
+    def flush_writes(self):
+        """blocks until any queued (write_behind) writes are complete"""
+        if getattr(self, "_write_queue", None) is not None:
+            self._write_queue.flush()
+
+    def close_writes(self):
+        """completes any queued (write_behind) writes and stops the writer thread.
+        a new one is started if the file is written again."""
+        if getattr(self, "_write_queue", None) is not None:
+            self._write_queue.close()
+            self._write_queue = None
+
+    def _on_file_written(self, path, error=None):
+        if not hasattr(self, "save_buttonbar"):
+            return
+        if error is None:
+            self.save_buttonbar.message.value = markdown(
+                f'_changes saved: {datetime.now().strftime("%H:%M:%S")}_'
+            )
+        else:
+            self.save_buttonbar.message.value = markdown(f"_☠️ save failed: {error}_")
+            self.save_buttonbar._unsaved_changes(True)
 
     def parse_file(self, path=None):
+        self.flush_writes()
         if self.path is not None and self.path.is_file():
             return parse_json_file(self.path, model=self.model)
         else:
             raise ValueError("self.path is not None and self.path.is_file() == False")
 
-    def load_file(self, path=None):
+    def load_file(self, path=None, stream=False, chunk_size=100):
+        """load the value from file.
+
+        if stream, the form is shown as soon as the first rows of a large array have
+        been read: the arrays of fields shown in an EditGrid (format="dataframe") are
+        appended to the grid in (geometrically growing) chunks, each validated as it
+        is read. This runs as a task on the event loop (if there is one running) which
+        is returned. Parsing is incremental if ijson is installed.
+        """
+        self.flush_writes()
         p = self._get_path(path=path)
+        if stream and self._stream_keys:
+            coro = self._stream_file(p, chunk_size=chunk_size)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(coro)  # no event loop running (i.e. not in a kernel)
+                return None
+            self._load_task = loop.create_task(coro)
+            return self._load_task
         self.value = parse_json_file(p, model=self.model)
         try:
             self.save_buttonbar._unsaved_changes(False)
         except:
             pass
 
+    @property
+    def _stream_keys(self):
+        """fields whose rows can be loaded in chunks (i.e. shown in an EditGrid)"""
+        di_widgets = getattr(getattr(self, "autowidget", None), "di_widgets", {})
+        return [k for k, v in di_widgets.items() if hasattr(v, "append_rows")]
+
+    async def _stream_file(self, path, chunk_size=100):
+        ui, stream_keys = self.autowidget, self._stream_keys
+        value, shown, streamed, n_rows = {}, set(), set(), {}
+        ui._holding_changes = True  # "_value" is set once everything is loaded
+        try:
+            for k, v in iter_json_file(path, stream_keys, chunk_size=chunk_size):
+                is_rows = k in stream_keys and isinstance(v, list)
+                try:
+                    v = validate_json_field(self.model, k, v)
+                except ValidationError as e:
+                    if not is_rows:
+                        raise
+                    n = n_rows.get(k, 0)
+                    raise ValueError(
+                        f"{k}: invalid row(s) in rows {n} to {n + len(v) - 1}\n{e}"
+                    ) from e
+                if is_rows:
+                    n_rows[k] = n_rows.get(k, 0) + len(v)
+                    if not streamed:  # show what has been read so far
+                        empty = {s: [] for s in stream_keys}
+                        ui._set_widget_values({**value, **empty})
+                        shown = set(value) | set(stream_keys)
+                    streamed.add(k)
+                    if v:
+                        ui.di_widgets[k].append_rows(v)
+                        await asyncio.sleep(0)  # let the front end update
+                else:
+                    value[k] = v
+            keys = list(self.model.__fields__) if self.model is not None else []
+            for k in keys:
+                if k not in value and k not in streamed:
+                    value[k] = validate_json_field(self.model, k, None)
+            ui._set_widget_values(
+                {k: v for k, v in value.items() if k not in shown or k in stream_keys}
+            )
+        except Exception as e:
+            if hasattr(self, "save_buttonbar"):
+                self.save_buttonbar.message.value = markdown(f"_☠️ load failed: {e}_")
+            raise
+        finally:
+            ui._discard_updates()  # the (debounced) calls made by setting the values
+            ui._holding_changes = False
+        old = ui._value
+        ui._rebuild_value({k: value.get(k) for k in keys + list(value) + list(streamed)})
+        ui.value_change = {"path": [], "old": old, "new": ui._value}
+        try:
+            self.save_buttonbar._unsaved_changes(False)
+        except:
+            pass
+
     @classmethod
     def create_autoui_renderer(
         cls,
@@ -373,7 +532,25 @@ class AutoUiCommonMethods(traitlets.HasTraits):
         self.fn_onvaluechange()
 
     def call_save_on_edit(self):
-        pass  # TODO - call_save_on_edit
+        """saves to file when the value changes, at most once every autosave_wait
+        seconds (always saving the latest value)."""
+        self.call_save_buttonbar()
+        self._stop_autosave()
+        self._autosave = Throttler(self._save_on_edit, wait=self.autosave_wait)
+        self.observe(self._autosave, "_value")
+
+    def _stop_autosave(self):
+        """removes the save_on_edit observer (if any). a pending save is made now."""
+        if getattr(self, "_autosave", None) is not None:
+            self.unobserve(self._autosave, "_value")
+            self._autosave.flush()
+            self._autosave = None
+
+    def _save_on_edit(self, change=None):
+        result = self.file()
+        self.save_buttonbar._unsaved_changes(False)
+        if not isinstance(result, concurrent.futures.Future):
+            self._on_file_written(self.path)
 
     def call_disable_edits(self):
         pass  # TODO - call_disable_edits
@@ -403,8 +580,14 @@ class AutoUi(AutoIpywidget, AutoUiCommonMethods):
         ] = lambda: None,
         validate_onchange=True,  # TODO: sort out how the validation works
         update_fdir_to_path_parent=True,
+        lazy_nested: bool = False,
+        update_policy: str = None,
+        write_behind: bool = False,
+        autosave_wait: float = 2.0,
     ):
         self.path = path
+        self.write_behind = write_behind
+        self.autosave_wait = autosave_wait
         if self.path is not None:
             self.fdir = str(self.path.parent)  # TODO: use traitlets_paths
         else:
@@ -420,11 +603,20 @@ class AutoUi(AutoIpywidget, AutoUiCommonMethods):
 
         # init app
         super().__init__(
-            schema=schema, value=value, update_map_widgets=None, fdir=self.fdir,
+            schema=schema,
+            value=value,
+            update_map_widgets=None,
+            fdir=self.fdir,
+            lazy_nested=lazy_nested,
+            update_policy=update_policy,
         )
         self._init_AutoUiCommonMethods()
         self.save_controls = save_controls
 
+    def close(self):
+        self.close_writes()
+        super().close()
+
 
 # -
 
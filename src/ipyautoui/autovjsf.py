@@ -103,6 +103,10 @@ class AutoVjsf(widgets.VBox, AutoUiCommonMethods):
     def _init_controls(self):
         self.vui.observe(self.update_value, "value")
 
+    def close(self):
+        self.close_writes()
+        super().close()
+
     def update_value(self, on_change):
         self._value = self.vui.value
 
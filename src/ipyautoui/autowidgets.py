@@ -27,7 +27,7 @@ import traitlets
 from copy import deepcopy
 from ipyautoui._utils import obj_from_importstr
 from ipyautoui.custom import modelrun, markdown_widget, editgrid
-from ipyautoui._utils import remove_non_present_kwargs
+from ipyautoui._utils import remove_non_present_kwargs, parse_update_policy
 from datetime import datetime
 
 #  -- CHANGE JSON-SCHEMA KEYS TO IPYWIDGET KEYS -------------
@@ -73,6 +73,31 @@ def create_widget_caller(schema, calling=None):
     return caller
 
 
+class UpdatePolicyMixin:
+    """mixin for text-like widgets. "update_policy" sets how edits are propagated
+    to the parent form (see `ipyautoui._utils.parse_update_policy`). it is read from the
+    schema (e.g. `Field(update_policy="on_blur")`) or given by the parent form
+    (`AutoObject.update_policy`). "on_blur" is handled by the front-end
+    (`continuous_update=False`) and "debounce" by the parent form."""
+
+    _update_policy = None
+
+    @property
+    def _continuous_update_widget(self):
+        return self
+
+    @property
+    def update_policy(self):
+        return self._update_policy
+
+    @update_policy.setter
+    def update_policy(self, value):
+        mode, wait = parse_update_policy(value)
+        self._update_policy = value
+        if mode == "on_blur":
+            self._continuous_update_widget.continuous_update = False
+
+
 class IntText(widgets.IntText):  # TODO: add value to these as arg?
     def __init__(self, schema):
         self.schema = schema
@@ -127,25 +152,31 @@ class FloatRangeSlider(widgets.FloatRangeSlider):
         super().__init__(**self.caller)
 
 
-class Text(widgets.Text):
+class Text(UpdatePolicyMixin, widgets.Text):
     def __init__(self, schema):
         self.schema = schema
         self.caller = create_widget_caller(schema)
+        update_policy = self.caller.pop("update_policy", None)
         super().__init__(**self.caller)
+        self.update_policy = update_policy
 
 
-class Textarea(widgets.Textarea):
+class Textarea(UpdatePolicyMixin, widgets.Textarea):
     def __init__(self, schema):
         self.schema = schema
         self.caller = create_widget_caller(schema)
+        update_policy = self.caller.pop("update_policy", None)
         super().__init__(**self.caller)
+        self.update_policy = update_policy
 
 
-class Combobox(widgets.Combobox):
+class Combobox(UpdatePolicyMixin, widgets.Combobox):
     def __init__(self, schema):
         self.schema = schema
         self.caller = create_widget_caller(schema)
+        update_policy = self.caller.pop("update_policy", None)
         super().__init__(**self.caller)
+        self.update_policy = update_policy
 
 
 class Dropdown(widgets.Dropdown):
@@ -291,13 +322,19 @@ class EditGrid(editgrid.EditGrid):
         super().__init__(**self.caller)
 
 
-class AutoMarkdown(markdown_widget.MarkdownWidget):
+class AutoMarkdown(UpdatePolicyMixin, markdown_widget.MarkdownWidget):
     def __init__(self, schema):
         self.schema = schema
         self.caller = create_widget_caller(
             schema, calling=markdown_widget.MarkdownWidget
         )
         super().__init__(**self.caller)
+        if "update_policy" in schema.keys():
+            self.update_policy = schema["update_policy"]
+
+    @property
+    def _continuous_update_widget(self):
+        return self.text
 
 
 if __name__ == "__main__":
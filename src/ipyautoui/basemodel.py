@@ -2,6 +2,7 @@
 import pathlib
 from pydantic import BaseModel
 from typing import Type
+from ipyautoui._utils import model_dumps, write_text_atomic
 
 def file(self:Type[BaseModel], path: pathlib.Path, **json_kwargs):
     """
@@ -17,7 +18,7 @@ def file(self:Type[BaseModel], path: pathlib.Path, **json_kwargs):
     """
     if "indent" not in json_kwargs.keys():
         json_kwargs.update({"indent": 4})
-    path.write_text(self.json(**json_kwargs), encoding="utf-8")
+    write_text_atomic(path, model_dumps(self, **json_kwargs), encoding="utf-8")
     
 
 class BaseModel(BaseModel):
@@ -23,7 +23,13 @@
 
 import traitlets
 import typing
+import pathlib
+import asyncio
+import inspect
+import functools
 import collections
+import contextlib
+import numbers
 import traceback
 
 import immutables
@@ -32,13 +38,13 @@ import pandas as pd
 import ipywidgets as widgets
 from typing import List
 from markdown import markdown
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 from ipydatagrid import DataGrid, TextRenderer, Expr, VegaExpr
 from ipydatagrid.datagrid import SelectionHelper
 
 import ipyautoui.autoipywidget as aui
 import ipyautoui.custom.save_button_bar as sb
-from ipyautoui._utils import round_sig_figs
+from ipyautoui._utils import round_sig_figs, run_sync, check_installed
 from ipyautoui.automapschema import attach_schema_refs
 
 # from ipyautoui.autoipywidget import AutoIpywidget
@@ -327,8 +333,267 @@ def is_incremental(li):
     return li == list(range(li[0], li[0] + len(li)))
 
 
+def diff_rows(old: list, new: list) -> dict:
+    """Positional diff of two lists of rows. Rows that are equal at the start and end
+    of both lists are unchanged, the rows between are paired up as "updated" and any
+    surplus rows are "inserted" (into new) or "deleted" (from old).
+
+    Args:
+        old (list): current rows
+        new (list): new rows
+
+    Returns:
+        dict: {"updated": [idx, ...], "inserted": [idx_new, ...], "deleted": [idx_old, ...]}
+
+    Example:
+        >>> diff_rows([1, 2, 3], [1, 4, 3])
+        {'updated': [1], 'inserted': [], 'deleted': []}
+        >>> diff_rows([1, 2, 3], [1, 2, 3, 4])
+        {'updated': [], 'inserted': [3], 'deleted': []}
+        >>> diff_rows([1, 2, 3], [1, 3])
+        {'updated': [], 'inserted': [], 'deleted': [1]}
+    """
+    n_old, n_new = len(old), len(new)
+    start = 0
+    while start < min(n_old, n_new) and old[start] == new[start]:
+        start += 1
+    end = 0
+    while (
+        end < min(n_old, n_new) - start and old[n_old - 1 - end] == new[n_new - 1 - end]
+    ):
+        end += 1
+    n_paired = min(n_old, n_new) - start - end
+    updated = [
+        start + i for i in range(n_paired) if old[start + i] != new[start + i]
+    ]
+    return {
+        "updated": updated,
+        "inserted": list(range(start + n_paired, n_new - end)),
+        "deleted": list(range(start + n_paired, n_old - end)),
+    }
+
+
+class ColumnFilter(BaseModel):
+    """A server-side filter on one column of a GridWrapper. Rows must meet all of
+    the conditions given. Conditions left as None are not applied."""
+
+    column: str = Field(..., description="field name or title of the column")
+    isin: list = None
+    eq: typing.Any = None
+    min: typing.Any = Field(None, description="inclusive")
+    max: typing.Any = Field(None, description="inclusive")
+    contains: str = None
+    regex: str = None
+    case: bool = True
+
+    def mask(self, series: pd.Series) -> np.ndarray:
+        """boolean mask of the values of the column that meet the conditions"""
+        mask = np.ones(len(series), dtype=bool)
+        valid = series.notna().to_numpy()
+        if self.isin is not None:
+            mask &= series.isin(self.isin).to_numpy()
+        for v, op in [(self.eq, "__eq__"), (self.min, "__ge__"), (self.max, "__le__")]:
+            if v is not None:
+                compare = np.zeros(len(series), dtype=bool)
+                compare[valid] = getattr(series[valid], op)(v).to_numpy()
+                mask &= compare
+        for pattern, regex in [(self.contains, False), (self.regex, True)]:
+            if pattern is not None:
+                mask &= valid & series.astype(str).str.contains(
+                    pattern, case=self.case, regex=regex
+                ).to_numpy(dtype=bool)
+        return mask
+
+
+class ColumnSpec(BaseModel):
+    """Column metadata of a GridWrapper compiled once from the schema properties.
+    Titles are used as the column names of the datagrid."""
+
+    fields: List[str]  # field names, in schema order
+    field_to_title: typing.Dict[str, str]
+    ignore: typing.Set[str]  # titles of columns not shown
+    order: List[str]  # titles of columns shown, in display order
+    sig_figs: typing.Dict[str, int]  # title: aui_sig_fig
+    column_widths: typing.Dict[str, int]  # title: aui_column_width
+    defaults: typing.Dict[str, typing.Any]  # field: default
+
+    @classmethod
+    def from_properties(
+        cls, properties: dict, order_cols: list = (), ignore_cols: list = ()
+    ):
+        titles = [di["title"] for di in properties.values()]
+        ignore = set(ignore_cols)
+        order_cols = [c for c in order_cols if c not in ignore]
+        return cls(
+            fields=list(properties.keys()),
+            field_to_title={k: di["title"] for k, di in properties.items()},
+            ignore=ignore,
+            order=order_cols + [t for t in titles if t not in order_cols + list(ignore)],
+            sig_figs={
+                di["title"]: di["aui_sig_fig"]
+                for di in properties.values()
+                if "aui_sig_fig" in di and di["title"] not in ignore
+            },
+            column_widths={
+                di["title"]: di["aui_column_width"]
+                for di in properties.values()
+                if "aui_column_width" in di and di["title"] not in ignore
+            },
+            defaults={k: di.get("default") for k, di in properties.items()},
+        )
+
+
+class RowValidationError(ValueError):
+    """Raised if rows of a GridWrapper value are not valid. `errors` maps the
+    position of each invalid row to its error messages (see `validate_rows`)."""
+
+    def __init__(self, errors: typing.Dict[int, List[str]], max_rows: int = 5):
+        self.errors = errors
+        rows = list(errors.items())
+        lines = [f"row {row}: {'; '.join(li)}" for row, li in rows[:max_rows]]
+        if len(rows) > max_rows:
+            lines.append(f"... and {len(rows) - max_rows} more invalid rows")
+        super().__init__(f"{len(rows)} invalid rows:\n" + "\n".join(lines))
+
+
+def _is_type(v, schema_type: str) -> bool:
+    if schema_type == "integer":
+        if isinstance(v, float):
+            return v.is_integer()
+        return isinstance(v, numbers.Integral) and not isinstance(v, (bool, np.bool_))
+    if schema_type == "number":
+        return isinstance(v, numbers.Real) and not isinstance(v, (bool, np.bool_))
+    if schema_type == "string":
+        return isinstance(v, str)
+    if schema_type == "boolean":
+        return isinstance(v, (bool, np.bool_))
+    return True
+
+
+MAP_SCHEMA_TYPE_INFERRED = frozenmap(
+    integer=("integer", "empty"),
+    number=("integer", "floating", "mixed-integer-float", "decimal", "empty"),
+    string=("string", "empty"),
+    boolean=("boolean", "empty"),
+)
+# ^ pandas inferred dtypes (pd.api.types.infer_dtype) that are always valid
+
+
+def _check_column_type(series: pd.Series, schema_type: str) -> np.ndarray:
+    """boolean mask of the (non-null) values in series that are not of schema_type.
+    columns of a matching dtype are accepted without looking at the values."""
+    notna = series.notna().to_numpy()
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in MAP_SCHEMA_TYPE_INFERRED.get(schema_type, (inferred,)):
+        return np.zeros(len(series), dtype=bool)
+    if schema_type == "integer" and series.dtype.kind == "f":
+        return notna & (series.to_numpy() != np.floor(series.to_numpy()))
+    invalid = np.zeros(len(series), dtype=bool)
+    invalid[notna] = [not _is_type(v, schema_type) for v in series[notna]]
+    return invalid
+
+
+def validate_columns(df: pd.DataFrame, properties: dict) -> dict:
+    """Validate the columns of df, a column per field, against the schema properties
+    of the fields. type, minimum, maximum, exclusiveMinimum, exclusiveMaximum,
+    minLength, maxLength, pattern and enum are checked column-wise. null values are
+    not checked.
+
+    Returns:
+        dict: {row position: [error messages]} for the invalid rows only.
+    """
+    errors = collections.defaultdict(list)
+
+    def add_errors(name, series, invalid, message):
+        for row in np.flatnonzero(invalid):
+            errors[int(row)].append(f"{name}: {series.iat[row]!r} {message}")
+
+    for name, di in properties.items():
+        if name not in df.columns:
+            continue
+        s = df[name]
+        notna = s.notna().to_numpy()
+        valid = notna
+        if di.get("type") in MAP_SCHEMA_TYPE_INFERRED:
+            invalid = _check_column_type(s, di["type"])
+            add_errors(name, s, invalid, f"is not of type {di['type']}")
+            valid = notna & ~invalid
+        if "enum" in di:
+            invalid = valid & ~s.isin(di["enum"]).to_numpy()
+            add_errors(name, s, invalid, f"is not one of {di['enum']}")
+        if di.get("type") in ("integer", "number"):
+            x = pd.to_numeric(s.where(valid), errors="coerce").to_numpy(dtype=float)
+            for k, op, message in [
+                ("minimum", np.less, "is less than"),
+                ("maximum", np.greater, "is greater than"),
+                ("exclusiveMinimum", np.less_equal, "is less than or equal to"),
+                ("exclusiveMaximum", np.greater_equal, "is greater than or equal to"),
+            ]:
+                if k in di:
+                    add_errors(name, s, op(x, di[k]), f"{message} {di[k]}")
+        if di.get("type") == "string":
+            strings = s.where(valid).astype(object)
+            n = strings.str.len().to_numpy(dtype=float)
+            if "minLength" in di:
+                add_errors(name, s, n < di["minLength"], "is too short")
+            if "maxLength" in di:
+                add_errors(name, s, n > di["maxLength"], "is too long")
+            if "pattern" in di:
+                is_match = strings.str.match(di["pattern"]).fillna(True)
+                invalid = ~is_match.to_numpy(dtype=bool)
+                add_errors(name, s, invalid, f"does not match {di['pattern']!r}")
+    return dict(sorted(errors.items()))
+
+
+def validate_rows(
+    value: typing.Union[list, pd.DataFrame], properties: dict
+) -> typing.Dict[int, List[str]]:
+    """Validate rows against the schema properties of a GridWrapper. The fields of
+    the rows are checked once per distinct set of keys and then the values are
+    validated column-wise (see `validate_columns`).
+
+    Args:
+        value (typing.Union[list, pd.DataFrame]): list of dicts or a DataFrame.
+        properties (dict): schema properties of the rows.
+
+    Returns:
+        typing.Dict[int, List[str]]: {row position: [error messages]} for the
+            invalid rows only. an empty dict if all are valid.
+    """
+    fields = list(properties.keys())
+    if isinstance(value, pd.DataFrame):
+        shapes = {tuple(value.columns): range(len(value))}
+    else:
+        shapes = collections.defaultdict(list)
+        for n, di in enumerate(value):
+            shapes[tuple(di.keys())].append(n)
+    errors = collections.defaultdict(list)
+    for shape, rows in shapes.items():
+        rejected = set(shape) ^ set(fields)
+        if rejected or len(shape) != len(fields):
+            message = (
+                "Schema fields and data fields do not match. "
+                f"Rejected Columns: {sorted(rejected)}"
+            )
+            for row in rows:
+                errors[row].append(message)
+    if not isinstance(value, pd.DataFrame):
+        value = pd.DataFrame.from_records(value, columns=fields)
+    for row, li in validate_columns(value, properties).items():
+        errors[row] += li
+    return dict(sorted(errors.items()))
+
+
 class GridWrapper(DataGrid):
     _value = traitlets.List()
+    page = traitlets.Int(default_value=0)
+    page_size = traitlets.Int(default_value=None, allow_none=True)
+    # ^ if set only this number of rows are sent to the datagrid at once
+    max_cell_updates = 500
+    # ^ above this number of changed cells the whole table is resent rather than
+    #   sending a message per cell
+    _view = None
+    # ^ keys of the rows in view (sorted / filtered). None: all rows in key order
 
     def __init__(
         self,
@@ -340,14 +605,26 @@ class GridWrapper(DataGrid):
         order_cols: list = [],  # TODO: this should be a trait
         ignore_cols: list = [],  # TODO: this should be a trait
         idx_start_from_one: bool = False,  # FIXME: don't think this is required.
+        columnar: bool = False,
+        page_size: int = None,
     ):
+        """
+        Args:
+            columnar (bool, optional): if True the data is stored as a DataFrame (one
+                typed array per column) and `value` (list of dicts) is only built when
+                requested. Reduces memory for large grids. Defaults to False.
+            page_size (int, optional): if given the data is shown in pages of this many
+                rows and only the current page is sent to the browser. Defaults to None.
+        """
         # accept schema or pydantic schema
         self.model, self.schema = aui._init_model_schema(schema, by_alias=by_alias)
         self.kwargs_datagrid_default = kwargs_datagrid_default
         self.idx_start_from_one = idx_start_from_one
-        self.di_cols_properties = self.schema["items"][
-            "properties"
-        ]  # Obtain each column's properties
+        self.columnar = columnar
+        self.page_size = page_size
+        self.filters = []
+        self.sort_by = []
+        self._invalidate_query_cache()
         self.ignore_cols = ignore_cols
         self.order_cols = order_cols
         self._init_df()
@@ -355,29 +632,57 @@ class GridWrapper(DataGrid):
         self.kwargs_datagrid_update = kwargs_datagrid_update
         self.value = value
 
+    @property
+    def schema(self):
+        return self._schema
+
+    @schema.setter
+    def schema(self, value):
+        self._schema = value
+        self.di_cols_properties = value["items"]["properties"]
+        # ^ Obtain each column's properties
+        self._column_spec = None
+
+    @property
+    def order_cols(self):
+        return self._order_cols
+
+    @order_cols.setter
+    def order_cols(self, value):
+        self._order_cols = list(value)
+        self._column_spec = None
+
+    @property
+    def ignore_cols(self):
+        return self._ignore_cols
+
+    @ignore_cols.setter
+    def ignore_cols(self, value):
+        self._ignore_cols = list(value)
+        self._column_spec = None
+
+    @property
+    def column_spec(self):
+        """column metadata. rebuilt only after schema, order_cols or ignore_cols change"""
+        if getattr(self, "_column_spec", None) is None:
+            self._column_spec = ColumnSpec.from_properties(
+                self.di_cols_properties,
+                order_cols=getattr(self, "_order_cols", []),
+                ignore_cols=getattr(self, "_ignore_cols", []),
+            )
+        return self._column_spec
+
     def _init_df(self):
         """Preparing initial empty dataframe."""
+        spec = self.column_spec
         li_default_value = [
-            {
-                col_data["title"]: (
-                    col_data["default"] if "default" in col_data.keys() else None
-                )
-                for col_name, col_data in self.di_cols_properties.items()
-            }
+            {spec.field_to_title[k]: v for k, v in spec.defaults.items()}
         ]  # default value
         df = pd.DataFrame.from_dict(li_default_value)
         df = df.drop(
             df.index
         )  # Empty dataframe to revert to when everything is deleted
-        if self.ignore_cols:
-            df = df.drop(
-                columns=self.ignore_cols
-            )  # Drop columns we want to ignore from datagrid
-        if self.order_cols:
-            order_cols = self.order_cols + [
-                col for col in df.columns if col not in self.order_cols
-            ]
-            df = df[order_cols]
+        df = df[spec.order]  # Drop ignored columns and order
         if self.idx_start_from_one is True:
             df = df.set_index(
                 pd.Index(range(1, len(df) + 1), dtype="int64", name="idx")
@@ -404,29 +709,119 @@ class GridWrapper(DataGrid):
         Args:
             key (int): The key of the row.
             value (dict): The data we want to input into the row.
+
+        Raises:
+            RowValidationError: if the row is not valid.
         """
-        if set([col for col, v in value.items()]) != set(
-            [col for col, v in self.value[0].items()]
-        ):
+        if set([col for col, v in value.items()]) != set(self.li_field_names):
             raise Exception("Columns of value given do not match with value keys.")
+        errors = self.validate([value])
+        if errors:
+            raise RowValidationError({key: errors[0]})
+        if self.columnar:
+            self._df_value.loc[self._df_value.index[key], list(value)] = list(
+                value.values()
+            )
+        else:
+            self._value[key] = {k: v for k, v in value.items()}
+        if self._update_view():
+            self._set_data()  # the row has moved in or out of view
+        else:
+            self._set_row_cells(key, value)
+
+    def map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return df with a column per field. Columns of df may be given by field name
+        or title, fields missing from df are given their default and other columns
+        are dropped.
+
+        Args:
+            df (pd.DataFrame): e.g. read from a file.
+        """
+        spec = self.column_spec
+        title_to_field = {v: k for k, v in spec.field_to_title.items()}
+        df = df.rename(
+            columns=lambda c: c if c in spec.defaults else title_to_field.get(c, c)
+        )
+        missing = {f: spec.defaults[f] for f in spec.fields if f not in df.columns}
+        if missing:
+            df = df.assign(**missing)
+        return df[spec.fields]
+
+    def to_dataframe(self, by_title: bool = False) -> pd.DataFrame:
+        """Return the data as a DataFrame with a column per field.
 
-        # value_with_titles is used for datagrid
-        value_with_titles = {
-            self.di_field_to_titles.get(name): v for name, v in value.items()
-        }
-        for col, sig_fig in self.aui_sig_figs.items():
-            value_with_titles[col] = round_sig_figs(
-                value_with_titles[col], sig_figs=sig_fig
+        Args:
+            by_title (bool, optional): name columns by title. Defaults to False.
+        """
+        if self.columnar:
+            df = self._cast_integers(self._df_value.reset_index(drop=True))
+        else:
+            df = self._cast_integers(self._to_store(self._value))
+        if by_title:
+            df = df.rename(columns=self.column_spec.field_to_title)
+        return df
+
+    def get_rows(self, keys: List[int]) -> list:
+        """Get the data of rows by key without materializing the whole value.
+
+        Args:
+            keys (List[int]): Keys of the rows.
+        """
+        if self.columnar:
+            return self._to_records(self._df_value.iloc[list(keys)])
+        return [self._value[k] for k in keys]
+
+    def append_rows(self, rows: list):
+        """Append rows to the end of the data.
+
+        Args:
+            rows (list): list of dicts.
+        """
+        if self.columnar and len(self._df_value) > 0:
+            self.value = pd.concat(
+                [self._df_value, self._to_store(rows)], ignore_index=True
             )
+        elif self.columnar:
+            self.value = rows
+        else:
+            self.value = self.value + list(rows)
 
-        for column, v in value_with_titles.items():
-            if self.idx_start_from_one is True:
-                # ^ If idx start from one then we must add one to the key
-                self.set_cell_value(column, key + 1, v)
-            else:
-                self.set_cell_value(column, key, v)
+    def delete_rows(self, keys: List[int]):
+        """Delete rows by key.
 
-        self._value[key] = {k: v for k, v in value.items()}
+        Args:
+            keys (List[int]): Keys of the rows.
+        """
+        keys = set(keys)
+        if self.columnar:
+            self.value = self._df_value.drop(
+                index=[i for n, i in enumerate(self._df_value.index) if n in keys]
+            )
+        else:
+            self.value = [v for i, v in enumerate(self.value) if i not in keys]
+
+    def _set_row_cells(self, row: int, value: dict, old: dict = None):
+        """Send the cells of a row to the datagrid by row position (O(1) per cell).
+        if old is given only the cells that differ from it are sent.
+
+        Args:
+            row (int): the key of the row.
+            value (dict): the new row data (field names as keys).
+            old (dict, optional): the current row data. Defaults to None.
+        """
+        row = self._page_rows.get(row)
+        if row is None:
+            return  # not on the current page
+        spec = self.column_spec
+        for name, v in value.items():
+            if old is not None and name in old and old[name] == v:
+                continue
+            column = spec.field_to_title.get(name)
+            if column in spec.ignore:
+                continue
+            if column in spec.sig_figs:
+                v = round_sig_figs(v, sig_figs=spec.sig_figs[column])
+            self.set_cell_value_by_index(column, row, v)
 
     def _round_sig_figs(self, df):
         """Round values in dataframe to desired significant figures as given in the schema.
@@ -435,28 +830,44 @@ class GridWrapper(DataGrid):
             df (pd.DataFrame): dataframe to round sig figs on.
         """
         for k, v in self.aui_sig_figs.items():
-            df.loc[:, k] = df.loc[:, k].apply(lambda x: round_sig_figs(x, sig_figs=v))
+            df[k] = round_sig_figs(df[k].to_numpy(), sig_figs=v)
         return df
 
     def _set_column_widths(self):
         """Set the column widths of the data grid based on aui_column_widths given in the schema."""
         self.column_widths = self.aui_column_widths  # Set column widths for data grid.
 
-    def _check_value(self, value: list):
-        """Checking column names in value passed match those within the dataframe.
+    def validate(self, value) -> typing.Dict[int, List[str]]:
+        """Validate value against the schema without setting it.
 
         Args:
-            value (list): list of dicts.
+            value: list of dicts or DataFrame.
+
+        Returns:
+            typing.Dict[int, List[str]]: {row position: [error messages]} for the
+                invalid rows only.
         """
-        for di_value in value:
-            columns = [name for name in di_value.keys()]
-            if not collections.Counter(columns) == collections.Counter(
-                self.li_field_names
-            ):
-                raise Exception(
-                    "Schema fields and data fields do not match.\nRejected Columns:"
-                    f" {set(columns) ^ set(self.li_field_names)}"
-                )
+        return validate_rows(value, self.di_cols_properties)
+
+    def _check_value(self, value, rows: typing.Optional[List[int]] = None):
+        """Check that the fields of the rows match those of the schema and that
+        values are valid.
+
+        Args:
+            value: list of dicts or DataFrame.
+            rows (typing.Optional[List[int]], optional): positions of the rows to
+                check (e.g. only those that have changed). Defaults to None (all).
+
+        Raises:
+            RowValidationError: `errors` gives the error messages of each invalid row.
+        """
+        if rows is None:
+            errors = self.validate(value)
+        else:
+            errors = self.validate([value[n] for n in rows])
+            errors = {rows[n]: li for n, li in errors.items()}
+        if errors:
+            raise RowValidationError(errors)
 
     def _set_titles(self, value: list):
         """Replace field names with titles in value passed.
@@ -464,10 +875,10 @@ class GridWrapper(DataGrid):
         Args:
             value (list): Replace all the keys in the dictionaries with associated titles from schema.
         """
+        field_to_title = self.column_spec.field_to_title
         data = [
             {
-                self.di_field_to_titles.get(name): value
-                for name, value in di_value.items()
+                field_to_title.get(name): value for name, value in di_value.items()
             }  # Replace name from value with title from schema
             for di_value in value
         ]
@@ -475,24 +886,139 @@ class GridWrapper(DataGrid):
 
     def filter_by_column_name(self, column_name: str, li_filter: list):
         """Filter rows to display based on a column name and a list of objects belonging to that column.
+        The filter is evaluated in the kernel (see `query`) and replaces any
+        existing filter on the column.
 
         Args:
             column_name (str): column name we want to apply the transform to.
             li_filter (list): Values within the column we want to display in the grid.
         """
-        self.transform(
-            [
-                {
-                    "type": "filter",
-                    "columnIndex": self.data.columns.get_loc(column_name) + 1,
-                    "operator": "in",
-                    "value": li_filter,
-                }
-            ]
+        field = self._get_field_name(column_name)
+        filters = [f for f in self.filters if self._get_field_name(f.column) != field]
+        self.query(
+            filters=filters + [ColumnFilter(column=column_name, isin=li_filter)],
+            sort_by=self.sort_by,
         )
 
+    # server-side filter and sort
+    # ----------------
+    def query(
+        self,
+        filters: List[ColumnFilter] = None,
+        sort_by: List[typing.Tuple[str, bool]] = None,
+    ):
+        """Filter and sort the rows in view. This is evaluated in the kernel on the
+        whole dataset such that only the matching rows are sent to the datagrid.
+        Call with no arguments to clear the query.
+
+        Args:
+            filters (List[ColumnFilter], optional): rows must meet all filters.
+            sort_by (List[typing.Tuple[str, bool]], optional): [(column, ascending), ...]
+                columns can be field names or titles.
+        """
+        self.filters = [
+            f if isinstance(f, ColumnFilter) else ColumnFilter(**f)
+            for f in (filters or [])
+        ]
+        self.sort_by = [tuple(s) for s in (sort_by or [])]
+        self._update_view(is_data_changed=False)
+        if self.page != 0:
+            self.page = 0  # _observe_page sets the data
+        else:
+            self._set_data()
+
+    def _get_field_name(self, column: str) -> str:
+        spec = self.column_spec
+        if column in spec.field_to_title:
+            return column
+        title_to_field = {v: k for k, v in spec.field_to_title.items()}
+        if column not in title_to_field:
+            raise ValueError(f"column {column} not in fields or titles")
+        return title_to_field[column]
+
+    def _invalidate_query_cache(self):
+        self._query_frame = None
+        self._sort_cache = {}
+
+    def _get_query_frame(self) -> pd.DataFrame:
+        """the data as a DataFrame with a column per field (built once per change)"""
+        if self.columnar:
+            return self._df_value
+        if self._query_frame is None:
+            self._query_frame = self._to_store(self._value)
+        return self._query_frame
+
+    def _get_sort_permutation(self, sort_by) -> np.ndarray:
+        """keys in sorted order. cached until the data changes"""
+        sort_by = tuple((self._get_field_name(c), bool(a)) for c, a in sort_by)
+        if sort_by not in self._sort_cache:
+            df = self._get_query_frame()
+            self._sort_cache[sort_by] = (
+                df.reset_index(drop=True)
+                .sort_values(
+                    by=[c for c, a in sort_by],
+                    ascending=[a for c, a in sort_by],
+                    kind="mergesort",
+                    na_position="last",
+                )
+                .index.to_numpy()
+            )
+        return self._sort_cache[sort_by]
+
+    def _update_view(self, is_data_changed: bool = True) -> bool:
+        """recompute the keys of the rows in view from the filters and sort order.
+        returns True if the view has changed."""
+        if is_data_changed:
+            self._invalidate_query_cache()
+        old = self._view
+        if not self.filters and not self.sort_by:
+            self._view = None
+            return old is not None
+        df = self._get_query_frame()
+        mask = np.ones(len(df), dtype=bool)
+        for f in self.filters:
+            mask &= f.mask(df[self._get_field_name(f.column)])
+        if self.sort_by:
+            keys = self._get_sort_permutation(self.sort_by)
+            keys = keys[mask[keys]]
+        else:
+            keys = np.flatnonzero(mask)
+        self._view = keys.tolist()
+        return old != self._view
+
+    # ----------------
+
     # move rows around
     # ----------------
+    def apply_permutation(self, permutation: List[int]):
+        """Reorder the rows in a single update. Row n of the new value is row
+        permutation[n] of the current value. Only the rows that have moved are
+        sent to the datagrid (see the value setter).
+
+        Args:
+            permutation (List[int]): the keys of the current value in the new order.
+        """
+        if sorted(permutation) != list(range(self.n_rows)):
+            raise ValueError("permutation must contain each key once.")
+        if self.columnar:
+            self.value = self._df_value.iloc[list(permutation)]
+        else:
+            value = self._value
+            self.value = [value[k] for k in permutation]
+
+    def move_rows(self, keys: List[int], index: int):
+        """Move rows as a block (in their current order) to a new position.
+
+        Args:
+            keys (List[int]): Keys of the rows to move.
+            index (int): position of the first moved row in the new value.
+        """
+        keys = sorted(set(keys))
+        set_keys = set(keys)
+        others = [k for k in range(self.n_rows) if k not in set_keys]
+        index = max(0, min(index, len(others)))
+        self.apply_permutation(others[:index] + keys + others[index:])
+
     def _swap_rows(self, key_a: int, key_b: int):
         """Swap two rows by giving their keys.
 
@@ -500,10 +1026,9 @@ class GridWrapper(DataGrid):
             key_a (int): Key of a row.
             key_b (int): Key of another row.
         """
-        di_a = self.value[key_a]
-        di_b = self.value[key_b]
-        self.set_row_value(key=key_b, value=di_a)
-        self.set_row_value(key=key_a, value=di_b)
+        permutation = list(range(self.n_rows))
+        permutation[key_a], permutation[key_b] = key_b, key_a
+        self.apply_permutation(permutation)
 
     def _move_row_down(self, key: int):
         """Move a row down.
@@ -511,7 +1036,7 @@ class GridWrapper(DataGrid):
         Args:
             key (int): Key of the row
         """
-        if key + 1 == len(self.data):
+        if key + 1 == self.n_rows:
             raise Exception("Can't move down last row.")
         self._swap_rows(key_a=key, key_b=key + 1)
 
@@ -533,8 +1058,9 @@ class GridWrapper(DataGrid):
         """
         if is_incremental(sorted(li_keys)) is False:
             raise Exception("Only select a property or block of properties.")
-        for key in sorted(li_keys):
-            self._move_row_up(key)
+        if min(li_keys) == 0:
+            raise Exception("Can't move up first row.")
+        self.move_rows(li_keys, min(li_keys) - 1)
         self.selections = [
             {"r1": min(li_keys) - 1, "r2": max(li_keys) - 1, "c1": 0, "c2": 2}
         ]
@@ -547,8 +1073,9 @@ class GridWrapper(DataGrid):
         """
         if is_incremental(sorted(li_keys)) is False:
             raise Exception("Only select a property or block of properties.")
-        for key in sorted(li_keys, reverse=True):
-            self._move_row_down(key)
+        if max(li_keys) + 1 == self.n_rows:
+            raise Exception("Can't move down last row.")
+        self.move_rows(li_keys, min(li_keys) + 1)
         self.selections = [
             {"r1": min(li_keys) + 1, "r2": max(li_keys) + 1, "c1": 0, "c2": 2}
         ]
@@ -558,14 +1085,11 @@ class GridWrapper(DataGrid):
     @property
     def di_default_value(self):
         """Obtain default value given in schema."""
-        return {
-            col_name: (col_data["default"] if "default" in col_data.keys() else None)
-            for col_name, col_data in self.di_cols_properties.items()
-        }
+        return dict(self.column_spec.defaults)
 
     @property
     def di_field_to_titles(self):
-        return {field: di["title"] for field, di in self.di_cols_properties.items()}
+        return self.column_spec.field_to_title
 
     @property
     def selected_rows(self):
@@ -581,43 +1105,41 @@ class GridWrapper(DataGrid):
                     _selected_rows.add(i)
         return list(_selected_rows)
 
+    @property
+    def selected_data_rows(self):
+        """Get the positions in `_data["data"]` of the selected rows. Selections are
+        made on the visible rows (i.e. after front-end sorts / filters), which
+        `_visible_rows` maps to rows of the data. O(selected)."""
+        visible_rows = self._visible_rows
+        if not visible_rows:
+            return sorted(self.selected_rows)
+        return [visible_rows[r] for r in sorted(self.selected_rows)]
+
     @property
     def selected_rows_data(self):
-        """Get the data selected in the table which is returned as a dataframe."""
-        s = self.selected_visible_cell_iterator
-        rows = set([l["r"] for l in s])
-        return [s._data["data"][r] for r in rows]
+        """Get the data selected in the table which is returned as a list of dicts
+        (titles as keys)."""
+        data = self._data["data"]
+        return [dict(data[r]) for r in self.selected_data_rows]
 
     @property
     def selected_keys(self):
         """Return the keys of the selected rows."""
-        s = self.selected_visible_cell_iterator
-        index = self.get_dataframe_index(self.data)
-        rows = set([l["r"] for l in s])
-        return [s._data["data"][r][index] for r in rows]
+        data = self._data["data"]
+        index = self._data["schema"]["primaryKey"][0]
+        return [data[r][index] for r in self.selected_data_rows]
 
     @property
     def li_field_names(self):
-        return [col_name for col_name, col_data in self.di_cols_properties.items()]
+        return self.column_spec.fields
 
     @property
     def aui_sig_figs(self):
-        self._aui_sig_figs = {
-            col_data["title"]: col_data["aui_sig_fig"]
-            for col_name, col_data in self.di_cols_properties.items()
-            if "aui_sig_fig" in col_data and col_data["title"] not in self.ignore_cols
-        }
-        return self._aui_sig_figs
+        return self.column_spec.sig_figs
 
     @property
     def aui_column_widths(self):
-        self._aui_column_widths = {
-            col_data["title"]: col_data["aui_column_width"]
-            for col_name, col_data in self.di_cols_properties.items()
-            if "aui_column_width" in col_data
-            and col_data["title"] not in self.ignore_cols
-        }  # Obtaining column widths from schema object
-        return self._aui_column_widths
+        return self.column_spec.column_widths  # Obtaining column widths from schema
 
     @property
     def kwargs_datagrid_update(self):
@@ -647,34 +1169,185 @@ class GridWrapper(DataGrid):
 
     @property
     def value(self):
+        if self.columnar:
+            return self._to_records(self._df_value)
+            # ^ built on request only. prefer `get_rows` for a few rows
         return self._value
 
     @value.setter
     def value(self, value):
-        if value == [] or value is None:
+        if value is None or len(value) == 0:
             self._value = []
+            self._df_value = self._to_store([])
+            self._update_view()
+            self._set_data()
+            return
+        if self.columnar:
+            self._check_value(value)
+            self._set_store(self._to_store(value))
+            return
+        if value is self._value:
+            # e.g. `grid.value[i] = row; grid.value = grid.value`. edited in-place so
+            # there is nothing to diff against. the table is resent.
+            self._check_value(value)
+            self._update_view()
+            self._set_data()
+            return
+        diff = diff_rows(self._value, value)
+        self._check_value(value, rows=diff["updated"] + diff["inserted"])
+        # ^ the other rows are unchanged and so already valid
+        is_patchable = self._is_patchable(diff, value)
+        old, self._value = self._value, list(value)
+        is_view_changed = self._update_view()
+        if is_patchable and not is_view_changed:
+            for row in diff["updated"]:
+                self._set_row_cells(row, value[row], old=old[row])
+        else:
+            self._set_data()
+
+    def _to_store(self, value) -> pd.DataFrame:
+        """Return value (list of dicts or DataFrame) as a DataFrame with a column per field."""
+        if isinstance(value, pd.DataFrame):
+            return value[self.li_field_names].reset_index(drop=True)
+        return pd.DataFrame.from_records(value, columns=self.li_field_names)
+
+    def _cast_integers(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return df with the columns of integer fields as nullable integers (Int64),
+        where all their values are whole numbers. pandas stores integer columns with
+        nulls as floats."""
+        properties = self.di_cols_properties
+        cast = {}
+        for c in df.columns:
+            if properties.get(c, {}).get("type") != "integer":
+                continue
+            try:
+                cast[c] = df[c].astype("Int64")
+            except (TypeError, ValueError):
+                pass  # e.g. not whole numbers
+        return df.assign(**cast) if cast else df
+
+    def _to_records(self, df: pd.DataFrame) -> list:
+        """Return the rows of df as a list of dicts of python values. nulls are given
+        as None (not NaN) and integer fields as int (not float)."""
+        df = self._cast_integers(df).astype(object)
+        return df.where(df.notna(), None).to_dict(orient="records")
+
+    def _set_store(self, df: pd.DataFrame):
+        """Set the columnar data. If only cells have changed these are sent to the
+        datagrid, compared column by column, rather than resending the whole table."""
+        old = getattr(self, "_df_value", None)
+        self._df_value = df
+        is_view_changed = self._update_view()
+        if (
+            old is None
+            or len(old) != len(df)
+            or is_view_changed
+            or not self._is_page_in_sync()
+        ):
+            self._set_data()
+            return
+        changed = np.zeros((len(df), len(df.columns)), dtype=bool)
+        for n, c in enumerate(df.columns):
+            a, b = old[c].to_numpy(), df[c].to_numpy()
+            changed[:, n] = ~((a == b) | (pd.isna(a) & pd.isna(b)))
+        if changed.sum() > self.max_cell_updates:
+            self._set_data()
+            return
+        rows = np.flatnonzero(changed.any(axis=1)).tolist()
+        li_old = self._to_records(old.iloc[rows])
+        for row, new, old_row in zip(rows, self.get_rows(rows), li_old):
+            self._set_row_cells(row, new, old=old_row)
+
+    def _is_patchable(self, diff: dict, value: list):
+        """Return True if the diff can be sent as cell updates rather than resending
+        the whole table. ipydatagrid has no front-end API for inserting or deleting
+        rows so that requires resending the table."""
+        if diff["inserted"] or diff["deleted"]:
+            return False
+        if not self._is_page_in_sync():
+            return False
+        n_cells = sum(
+            1
+            for row in diff["updated"]
+            for k, v in value[row].items()
+            if self._value[row].get(k) != v
+        )
+        return n_cells <= self.max_cell_updates
+
+    def _is_page_in_sync(self):
+        """the rows in the datagrid are those of the current page"""
+        return len(self._data["data"]) == len(self._page_rows)
+
+    def _set_data(self):
+        """Set the table from the value (resends the current page to the front end)."""
+        if self.page_size and self.page > self.n_pages - 1:
+            self.page = self.n_pages - 1  # _observe_page sets the data
+            return
+        keys = self.page_keys
+        self._page_rows = {k: n for n, k in enumerate(keys)}
+        if len(keys) == 0:
             self.data = self.df_empty
+            return
+        if self.columnar:
+            df = self._df_value.iloc[self._key_indexer(keys)]
+            df = df.rename(columns=self.column_spec.field_to_title)
         else:
-            self._check_value(value)
-            self._value = value
-            data = self._set_titles(self._value)
-            df = pd.DataFrame.from_dict(data)
-            if self.ignore_cols:
-                df = df.drop(
-                    columns=self.ignore_cols
-                )  # Drop columns we want to ignore from datagrid
-            if self.order_cols:
-                order_cols = self.order_cols + [
-                    col for col in df.columns if col not in self.order_cols
-                ]
-                df = df[order_cols]
-            if self.idx_start_from_one is True:
-                df = df.set_index(
-                    pd.Index(
-                        range(1, len(df) + 1), dtype="int64", name="idx"
-                    )  # BUG: hardcoded + application specific
-                )
-            self.data = self._round_sig_figs(df)
+            if isinstance(keys, range):
+                rows = self._value[keys.start : keys.stop]
+            else:
+                rows = [self._value[k] for k in keys]
+            df = pd.DataFrame.from_dict(self._set_titles(rows))
+        df = df[self.column_spec.order]  # Drop ignored columns and order
+        if self.idx_start_from_one is True:
+            df.index = pd.Index(
+                np.asarray(keys, dtype="int64") + 1, name="idx"
+            )  # BUG: hardcoded + application specific
+        else:
+            df.index = pd.Index(np.asarray(keys, dtype="int64"))
+            # ^ the key (position in value) of each row on the page
+        self.data = self._round_sig_figs(df)
+
+    @staticmethod
+    def _key_indexer(keys):
+        return slice(keys.start, keys.stop) if isinstance(keys, range) else list(keys)
+
+    # paging
+    # ----------------
+    @property
+    def n_rows(self):
+        """number of rows in value"""
+        return len(self._df_value) if self.columnar else len(self._value)
+
+    @property
+    def view_keys(self):
+        """keys of the rows in view in the order shown"""
+        return range(self.n_rows) if self._view is None else self._view
+
+    @property
+    def n_pages(self):
+        if not self.page_size:
+            return 1
+        return max(1, -(-len(self.view_keys) // self.page_size))
+
+    @property
+    def page_keys(self):
+        """keys of the rows on the current page"""
+        view_keys = self.view_keys
+        if not self.page_size:
+            return view_keys
+        page = min(self.page, self.n_pages - 1)
+        return view_keys[page * self.page_size : (page + 1) * self.page_size]
+
+    @traitlets.validate("page")
+    def _valid_page(self, proposal):
+        return max(0, min(proposal["value"], self.n_pages - 1))
+
+    @traitlets.observe("page", "page_size")
+    def _observe_page(self, change):
+        if getattr(self, "_page_rows", None) is not None:
+            self._set_data()
+
+    # ----------------
 
 
 if __name__ == "__main__":
@@ -736,11 +1409,80 @@ class DataHandler(BaseModel):
     fn_copy: typing.Callable
 
 
+class BatchDataHandler(BaseModel):
+    """DataHandler for multi-row operations in one call. If fn_get_changes is given
+    reloads fetch only the rows changed since the last load rather than all data.
+    fn_get_changes(since) must return {"version": .., "upserted": [rows], "deleted":
+    [primary keys]} and, when since is None, all rows as "upserted"."""
+
+    fn_get_all_data: typing.Callable = None
+    fn_post_many: typing.Callable
+    fn_patch_many: typing.Callable
+    fn_delete_many: typing.Callable
+    fn_copy_many: typing.Callable = None  # defaults to fn_post_many
+    fn_get_changes: typing.Callable = None
+    primary_key: str = Field(
+        None, description="field that identifies a row. required by fn_get_changes"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def _check_get_data(cls, values):
+        if values["fn_get_all_data"] is None and values["fn_get_changes"] is None:
+            raise ValueError("one of fn_get_all_data or fn_get_changes is required")
+        if values["fn_get_changes"] is not None and values["primary_key"] is None:
+            raise ValueError("primary_key is required with fn_get_changes")
+        return values
+
+
 class RowUiCallables(BaseModel):
     add: typing.Callable
     edit: typing.Callable
 
 
+class GridPager(widgets.HBox):
+    """previous / next page controls for a paged GridWrapper"""
+
+    def __init__(self, grid: GridWrapper):
+        self.grid = grid
+        self._init_form()
+        self._init_controls()
+        self._update_pager()
+
+    def _init_form(self):
+        super().__init__(layout=widgets.Layout(padding="0px 20px"))
+        self.previous = widgets.Button(
+            icon="chevron-left", layout=widgets.Layout(width=BUTTON_WIDTH_MIN)
+        )
+        self.next = widgets.Button(
+            icon="chevron-right", layout=widgets.Layout(width=BUTTON_WIDTH_MIN)
+        )
+        self.message = widgets.HTML()
+        self.children = [self.previous, self.message, self.next]
+
+    def _init_controls(self):
+        self.previous.on_click(self._previous)
+        self.next.on_click(self._next)
+        self.grid.observe(self._update_pager, ["page", "page_size", "_data"])
+
+    def _previous(self, click):
+        self.grid.page -= 1
+
+    def _next(self, click):
+        self.grid.page += 1
+
+    def _update_pager(self, change=None):
+        if not self.grid.page_size:
+            self.layout.display = "none"
+            return
+        self.layout.display = "flex"
+        self.previous.disabled = self.grid.page == 0
+        self.next.disabled = self.grid.page >= self.grid.n_pages - 1
+        self.message.value = (
+            f"page {self.grid.page + 1} of {self.grid.n_pages}"
+            f" ({len(self.grid.view_keys)} rows)"
+        )
+
+
 # -
 
 # IDEA: Possible implementations -@jovyan at 9/3/2022, 11:29:20 AM
@@ -750,6 +1492,9 @@ class RowUiCallables(BaseModel):
 # doesn't require a _value trait as it is never used within EditGrid.
 class EditGrid(widgets.VBox):
     _value = traitlets.List()
+    value_version = traitlets.Int(default_value=0)
+    # ^ incremented whenever the value changes. in columnar mode "_value" is not kept
+    #   in sync (rows aren't materialized), so observe this rather than "_value"
 
     def __init__(
         self,
@@ -765,14 +1510,28 @@ class EditGrid(widgets.VBox):
         ignore_cols: list = [],
         description: str = "",
         fn_on_copy: typing.Callable = None,
+        columnar: bool = False,
+        page_size: int = None,
+        run_in_executor: bool = False,
     ):
+        """
+        Args:
+            datahandler: DataHandler or BatchDataHandler. its functions can be `async`
+                in which case they run as tasks on the event loop without blocking the
+                UI. changes are shown optimistically and rolled back on failure.
+            run_in_executor (bool, optional): run datahandler functions that are not
+                `async` in a thread pool executor, as above. Defaults to False.
+        """
         self.ui_add = ui_add
         self.ui_edit = ui_edit
         self.fn_on_copy = fn_on_copy
         self.model, self.schema = aui._init_model_schema(schema, by_alias=by_alias)
         self.datahandler = datahandler
-        if self.datahandler is not None:
-            value = self.datahandler.fn_get_all_data()
+        self.run_in_executor = run_in_executor
+        self._data_version = None
+        self._task = None
+        if self.datahandler is not None and not self.is_async_datahandler:
+            value = run_sync(self._get_all_data())
         self.out = widgets.Output()
         self._init_form(
             value=value,
@@ -782,9 +1541,13 @@ class EditGrid(widgets.VBox):
             order_cols=order_cols,
             ignore_cols=ignore_cols,
             description=description,
+            columnar=columnar,
+            page_size=page_size,
         )
         self._init_controls()
         self._edit_bool = False  # Initially define edit mode to be false
+        if self.is_async_datahandler:
+            self._run_datahandler(self._reload_all_data, message="Loading")
 
     def _init_form(
         self,
@@ -795,6 +1558,8 @@ class EditGrid(widgets.VBox):
         order_cols,
         ignore_cols,
         description,
+        columnar=False,
+        page_size=None,
     ):
         super().__init__(layout={"width": "100%"})  # main container
         self.button_bar = ButtonBar(
@@ -813,7 +1578,10 @@ class EditGrid(widgets.VBox):
             kwargs_datagrid_update=kwargs_datagrid_update,
             order_cols=order_cols,
             ignore_cols=ignore_cols,
+            columnar=columnar,
+            page_size=page_size,
         )
+        self.pager = GridPager(self.grid)
         self.baseform = BaseForm(
             schema=self.schema["items"],
             save=self._save,
@@ -824,7 +1592,13 @@ class EditGrid(widgets.VBox):
         self.button_bar.layout = widgets.Layout(padding="0px 20px")
         self.baseform.save_button_bar.layout = widgets.Layout(padding="0px 20px")
         self.baseform.layout = widgets.Layout(padding="0px 0px 40px 0px")
-        self.children = [self.description, self.button_bar, self.baseform, self.grid]
+        self.children = [
+            self.description,
+            self.button_bar,
+            self.baseform,
+            self.grid,
+            self.pager,
+        ]
         self.baseform.layout.display = "none"  # Hide base form menu
 
     def _init_controls(self):
@@ -884,26 +1658,34 @@ class EditGrid(widgets.VBox):
 
     def _copy(self):
         try:
-            if self.grid.selected_keys == set():
+            selected_keys = self.grid.selected_keys
+            if not selected_keys:
                 self.button_bar.message.value = markdown(
                     "  👇 _Please select a row from the table!_ "
                 )
             else:
-                li_values_selected = [
-                    self.value[i] for i in sorted([i for i in self.grid.selected_keys])
-                ]
+                li_values_selected = self.grid.get_rows(sorted(selected_keys))
                 if self.fn_on_copy is not None:
                     li_values_selected = self.fn_on_copy(li_values_selected)
+                self.button_bar.message.value = markdown("  📝 _Copied Data_ ")
+                self._edit_bool = False  # Want to add the values
                 if self.datahandler is not None:
-                    for value in li_values_selected:
-                        self.datahandler.fn_copy(value)
-                    self._reload_all_data()
+
+                    async def copy(base):
+                        await self._datahandler_copy(li_values_selected)
+                        await self._reload_all_data(base)
+
+                    self._run_datahandler(
+                        copy,
+                        optimistic=functools.partial(
+                            self.grid.append_rows, li_values_selected
+                        ),
+                        message="Copying",
+                    )
                 else:
-                    self.value += li_values_selected
+                    self.grid.append_rows(li_values_selected)
+                    self._update_value_from_grid()
                     # ^ add copied values
-
-                self.button_bar.message.value = markdown("  📝 _Copied Data_ ")
-                self._edit_bool = False  # Want to add the values
         except Exception as e:
             self.button_bar.message.value = markdown(
                 "  👇 _Please select a row from the table!_ "
@@ -913,21 +1695,28 @@ class EditGrid(widgets.VBox):
     def _delete(self):
         try:
             self._set_toggle_buttons_to_false()
-            if self.grid.selected_keys:
-                print(f"Row Number: {self.grid.selected_keys}")
+            selected_keys = self.grid.selected_keys
+            if selected_keys:
+                print(f"Row Number: {selected_keys}")
+                self.button_bar.message.value = markdown("  🗑️ _Deleted Row_ ")
                 if self.datahandler is not None:
-                    value = [self.value[i] for i in self.grid.selected_keys]
-                    for v in value:
-                        self.datahandler.fn_delete(v)
-                    self._reload_all_data()
+                    li_values_selected = self.grid.get_rows(selected_keys)
+
+                    async def delete(base):
+                        await self._datahandler_delete(li_values_selected)
+                        await self._reload_all_data(base)
+
+                    self._run_datahandler(
+                        delete,
+                        optimistic=functools.partial(
+                            self.grid.delete_rows, set(selected_keys)
+                        ),
+                        message="Deleting",
+                    )
                 else:
-                    self.value = [
-                        value
-                        for i, value in enumerate(self.value)
-                        if i not in self.grid.selected_keys
-                    ]
-                    # ^ Only set for values NOT in self.grid.selected_keys
-                self.button_bar.message.value = markdown("  🗑️ _Deleted Row_ ")
+                    self.grid.delete_rows(set(selected_keys))
+                    self._update_value_from_grid()
+                    # ^ Only keep values NOT in selected_keys
 
             else:
                 self.button_bar.message.value = markdown(
@@ -946,30 +1735,48 @@ class EditGrid(widgets.VBox):
         if self._edit_bool:  # If editing then use patch
             if self.datahandler is not None:
                 value = self.baseform.value
-                self.datahandler.fn_patch(value)
-                self._reload_all_data()
+
+                async def patch(base):
+                    await self._datahandler_patch([value])
+                    await self._reload_all_data(base)
+
+                self._run_datahandler(
+                    patch,
+                    optimistic=functools.partial(
+                        self.grid.set_row_value, self.selected_row, value
+                    ),
+                    message="Saving",
+                )
+            elif self.grid.columnar:
+                self.grid.set_row_value(self.selected_row, self.baseform.value)
             else:
-                value = self.value
+                value = list(self.value)
                 value[self.selected_row] = self.baseform.value
                 self.value = value
-                # ^ Call setter
+                # ^ Call setter. only the edited row is sent to the grid
         else:  # Else, if adding values, use post
             if self.datahandler is not None:
                 value = self.baseform.value
-                self.datahandler.fn_post(value)
-                self._reload_all_data()
+
+                async def post(base):
+                    await self._datahandler_post([value])
+                    await self._reload_all_data(base)
+
+                self._run_datahandler(
+                    post,
+                    optimistic=functools.partial(self.grid.append_rows, [value]),
+                    message="Saving",
+                )
             else:
-                if not self.grid._data["data"]:  # If no data in grid
-                    self.value = [self.baseform.value]
-                else:
-                    # Append new row onto data frame and set to grid's data.
-                    value = self.value
-                    value.append(self.baseform.value)
-                    self.value = value  # Call setter
+                # Append new row onto data frame and set to grid's data.
+                self.grid.append_rows([self.baseform.value])
+                self._update_value_from_grid()
 
     def _onsave(self):
         self._display_grid()
         self._set_toggle_buttons_to_false()
+        if self.is_in_flight:
+            return  # the in-flight message is shown until the datahandler is done
         if self._edit_bool:  # If editing
             self.button_bar.message.value = markdown(
                 "  💾 _Successfully updated row_ "
@@ -1002,19 +1809,363 @@ class EditGrid(widgets.VBox):
     def _display_baseform(self):
         self.baseform.layout.display = "block"  # Displays base form menu
 
-    def _reload_all_data(self):
-        if self.datahandler is not None:
-            self.value = self.datahandler.fn_get_all_data()
+    # datahandler
+    # ----------------
+    @property
+    def is_batch_datahandler(self):
+        return isinstance(self.datahandler, BatchDataHandler)
+
+    @property
+    def is_async_datahandler(self):
+        if self.datahandler is None:
+            return False
+        if self.run_in_executor:
+            return True
+        return any(inspect.iscoroutinefunction(v) for k, v in self.datahandler)
+
+    @property
+    def is_in_flight(self):
+        return self._task is not None and not self._task.done()
+
+    def _run_datahandler(
+        self,
+        operation: typing.Callable,
+        optimistic: typing.Callable = None,
+        message: str = "",
+    ):
+        """Run an operation that calls the datahandler and reloads the data.
+        If the datahandler is synchronous this completes before returning. Otherwise it
+        runs as a task on the event loop: `optimistic` is applied to the grid straight
+        away, `message` is shown until complete and on failure the value is rolled back.
+        Operations started whilst another is in flight are queued and run in order.
+
+        Args:
+            operation (typing.Callable): `async def operation(base)` where base is the
+                value before the optimistic update (None if synchronous).
+            optimistic (typing.Callable, optional): updates the grid optimistically.
+            message (str, optional): in-flight message. e.g. "Saving"
+        """
+        if not self.is_async_datahandler:
+            run_sync(operation(None))
+            return
+        previous = self._task if self.is_in_flight else None
+        base = list(self.value)  # copy as set_row_value updates rows in place
+        if optimistic is not None:
+            optimistic()
+            self._update_value_from_grid()
+        if previous is None:
+            self.button_bar.message.value = markdown(f"  ⏳ _{message}..._ ")
+        else:
+            self.button_bar.message.value = markdown(
+                f"  ⏳ _{message} (queued until the previous change completes)..._ "
+            )
+            base = None  # the value when the previous operation is complete
+        coro = self._run_or_rollback(operation, base, message, previous=previous)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(coro)  # no event loop running (i.e. not in a kernel)
+            return
+        self._task = loop.create_task(coro)
+
+    async def _run_or_rollback(
+        self,
+        operation: typing.Callable,
+        base: list = None,
+        message: str = "",
+        previous: asyncio.Task = None,
+    ):
+        if previous is not None:
+            with contextlib.suppress(Exception):
+                await previous  # run after (not concurrently with) the previous one
+            self.button_bar.message.value = markdown(f"  ⏳ _{message}..._ ")
+        if base is None:
+            base = list(self.value)
+        try:
+            await operation(base)
+            self.button_bar.message.value = markdown(f"  ✔️ _{message} complete_ ")
+        except Exception as e:
+            self.value = base
+            self.button_bar.message.value = markdown(
+                f"  ☠️ _{message} failed. changes reverted_ "
+            )
+            traceback.print_exc()
+
+    async def _call(self, fn: typing.Callable, *args, **kwargs):
+        """call a datahandler function. `async` functions are awaited and, if
+        run_in_executor, others are run in the default thread pool executor."""
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        if self.run_in_executor:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(fn, *args, **kwargs)
+            )
+        return fn(*args, **kwargs)
+
+    async def _datahandler_post(self, values: list):
+        if self.is_batch_datahandler:
+            await self._call(self.datahandler.fn_post_many, values)
+        else:
+            for value in values:
+                await self._call(self.datahandler.fn_post, value)
+
+    async def _datahandler_patch(self, values: list):
+        if self.is_batch_datahandler:
+            await self._call(self.datahandler.fn_patch_many, values)
+        else:
+            for value in values:
+                await self._call(self.datahandler.fn_patch, value)
+
+    async def _datahandler_delete(self, values: list):
+        if self.is_batch_datahandler:
+            await self._call(self.datahandler.fn_delete_many, values)
+        else:
+            for value in values:
+                await self._call(self.datahandler.fn_delete, value)
+
+    async def _datahandler_copy(self, values: list):
+        if self.is_batch_datahandler:
+            fn = self.datahandler.fn_copy_many or self.datahandler.fn_post_many
+            await self._call(fn, values)
+        else:
+            for value in values:
+                await self._call(self.datahandler.fn_copy, value)
+
+    @property
+    def _is_incremental_reload(self):
+        return (
+            self.is_batch_datahandler and self.datahandler.fn_get_changes is not None
+        )
+
+    async def _get_all_data(self):
+        if self._is_incremental_reload:
+            changes = await self._call(self.datahandler.fn_get_changes, since=None)
+            self._data_version = changes.get("version")
+            return changes.get("upserted", [])
+        return await self._call(self.datahandler.fn_get_all_data)
+
+    async def _reload_all_data(self, base: list = None):
+        """reload the data from the datahandler.
+
+        Args:
+            base (list, optional): the value to merge changes into. Defaults to the
+                current value. (i.e. the value before any optimistic update)
+        """
+        if self.datahandler is None:
+            return
+        if self._is_incremental_reload:
+            changes = await self._call(
+                self.datahandler.fn_get_changes, since=self._data_version
+            )
+            self._apply_changes(changes, base=base)
+        else:
+            self.value = await self._call(self.datahandler.fn_get_all_data)
+
+    def _apply_changes(self, changes: dict, base: list = None):
+        """merge the rows changed since the last load into the value. rows are
+        matched on the datahandler's primary_key. new rows are appended."""
+        self._data_version = changes.get("version")
+        pk = self.datahandler.primary_key
+        deleted = set(changes.get("deleted", []))
+        upserted = {v[pk]: v for v in changes.get("upserted", [])}
+        if base is None:
+            if not deleted and not upserted:
+                return
+            base = self.value
+        value = []
+        for v in base:
+            if v[pk] in deleted:
+                continue
+            value.append(upserted.pop(v[pk], v))
+        self.value = value + list(upserted.values())
+
+    # ----------------
 
     @property
     def value(self):
-        self._value = self.grid._value
-        return self._value
+        return self.grid.value
 
     @value.setter
     def value(self, value):
         self.grid.value = value
-        self._value = self.grid.value
+        self._update_value_from_grid()
+
+    def append_rows(self, rows: list):
+        """Append rows to the end of the grid. e.g. when loading data in chunks.
+
+        Args:
+            rows (list): list of dicts.
+        """
+        self.grid.append_rows(rows)
+        self._update_value_from_grid()
+
+    @classmethod
+    def from_csv(
+        cls,
+        schema: dict,
+        path,
+        chunksize: int = 50000,
+        fn_progress: typing.Callable = None,
+        **kwargs,
+    ):
+        """Create an EditGrid (columnar by default) with data read from a csv file.
+        kwargs are passed to EditGrid. see `read_csv`."""
+        editgrid = cls(schema, **{"columnar": True, **kwargs})
+        editgrid.read_csv(path, chunksize=chunksize, fn_progress=fn_progress)
+        return editgrid
+
+    @classmethod
+    def from_parquet(
+        cls,
+        schema: dict,
+        path,
+        chunksize: int = 50000,
+        fn_progress: typing.Callable = None,
+        **kwargs,
+    ):
+        """Create an EditGrid (columnar by default) with data read from a parquet
+        file. kwargs are passed to EditGrid. see `read_parquet`."""
+        editgrid = cls(schema, **{"columnar": True, **kwargs})
+        editgrid.read_parquet(path, chunksize=chunksize, fn_progress=fn_progress)
+        return editgrid
+
+    @classmethod
+    def from_excel(
+        cls, schema: dict, path, fn_progress: typing.Callable = None, **kwargs
+    ):
+        """Create an EditGrid (columnar by default) with data read from an excel
+        file. kwargs are passed to EditGrid. see `read_excel`."""
+        editgrid = cls(schema, **{"columnar": True, **kwargs})
+        editgrid.read_excel(path, fn_progress=fn_progress)
+        return editgrid
+
+    @property
+    def _str_dtypes(self) -> dict:
+        """dtype of string columns (by field name and title) when reading files"""
+        spec = self.grid.column_spec
+        properties = self.grid.di_cols_properties
+        fields = [k for k, v in properties.items() if v.get("type") == "string"]
+        return {c: str for f in fields for c in (f, spec.field_to_title[f])}
+
+    def read_csv(
+        self,
+        path,
+        chunksize: int = 50000,
+        fn_progress: typing.Callable = None,
+        **kwargs,
+    ):
+        """Replace the value with data read from a csv file. see `read_chunks`.
+        kwargs are passed to `pd.read_csv`."""
+        chunks = pd.read_csv(
+            path, chunksize=chunksize, **{"dtype": self._str_dtypes, **kwargs}
+        )
+        with chunks:
+            self.read_chunks(
+                chunks, name=pathlib.Path(path).name, fn_progress=fn_progress
+            )
+
+    def read_parquet(
+        self,
+        path,
+        chunksize: int = 50000,
+        fn_progress: typing.Callable = None,
+        **kwargs,
+    ):
+        """Replace the value with data read from a parquet file. see `read_chunks`.
+        it is read in chunks of chunksize rows if pyarrow is installed, or a row group
+        at a time if fastparquet is installed (chunksize is then ignored). kwargs are
+        passed to `pd.read_parquet` (if not read in chunks)."""
+        if check_installed("pyarrow") and not kwargs:
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize)
+            chunks = (batch.to_pandas() for batch in batches)
+        elif check_installed("fastparquet") and not kwargs:
+            import fastparquet
+
+            chunks = fastparquet.ParquetFile(path).iter_row_groups()
+        else:
+            chunks = [pd.read_parquet(path, **kwargs)]
+        self.read_chunks(chunks, name=pathlib.Path(path).name, fn_progress=fn_progress)
+
+    def read_excel(self, path, fn_progress: typing.Callable = None, **kwargs):
+        """Replace the value with data read from an excel file. see `read_chunks`.
+        kwargs are passed to `pd.read_excel`."""
+        df = pd.read_excel(path, **{"dtype": self._str_dtypes, **kwargs})
+        self.read_chunks([df], name=pathlib.Path(path).name, fn_progress=fn_progress)
+
+    def read_chunks(
+        self,
+        chunks: typing.Iterable[pd.DataFrame],
+        name: str = "",
+        fn_progress: typing.Callable = None,
+    ):
+        """Replace the value with the rows of DataFrames. columns are mapped to fields
+        by name or title (see `GridWrapper.map_columns`). progress is shown as each
+        chunk is read and the grid is updated once, from a DataFrame (no list of
+        dicts is created unless the grid isn't columnar). the datahandler is not
+        called.
+
+        Args:
+            chunks (typing.Iterable[pd.DataFrame]): e.g. `pd.read_csv(chunksize=...)`
+            name (str, optional): shown in the progress message. e.g. file name
+            fn_progress (typing.Callable, optional): called with the number of rows
+                read after each chunk.
+
+        Raises:
+            RowValidationError: if rows are not valid. the value is not changed.
+        """
+        frames, ignored, n = [], set(), 0
+        for chunk in chunks:
+            ignored |= set(chunk.columns) - set(self.grid.li_field_names)
+            frames.append(self.grid.map_columns(chunk))
+            n += len(chunk)
+            self.button_bar.message.value = markdown(
+                f"  ⏳ _Reading {name}: {n} rows_ "
+            )
+            if fn_progress is not None:
+                fn_progress(n)
+        ignored -= set(self.grid.column_spec.field_to_title.values())
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = self.grid._to_store([])
+        try:
+            self.value = df if self.grid.columnar else self.grid._to_records(df)
+            # ^ blank cells given as None (not NaN) and integers as int (not float)
+        except RowValidationError as e:
+            self.button_bar.message.value = markdown(
+                f"  ☠️ _{len(e.errors)} invalid rows in {name}. not loaded_ "
+            )
+            raise
+        message = f"  ✔️ _Loaded {n} rows from {name}_ "
+        if ignored:
+            message += f"_(ignored columns: {', '.join(sorted(map(str, ignored)))})_"
+        self.button_bar.message.value = markdown(message)
+
+    def to_csv(self, path, by_title: bool = False, **kwargs):
+        """Write the data to a csv file. kwargs are passed to `pd.DataFrame.to_csv`."""
+        df = self.grid.to_dataframe(by_title=by_title)
+        df.to_csv(path, **{"index": False, **kwargs})
+
+    def to_parquet(self, path, by_title: bool = False, **kwargs):
+        """Write the data to a parquet file. kwargs are passed to
+        `pd.DataFrame.to_parquet`."""
+        df = self.grid.to_dataframe(by_title=by_title)
+        df.to_parquet(path, **{"index": False, **kwargs})
+
+    def to_excel(self, path, by_title: bool = False, **kwargs):
+        """Write the data to an excel file. kwargs are passed to
+        `pd.DataFrame.to_excel`."""
+        df = self.grid.to_dataframe(by_title=by_title)
+        df.to_excel(path, **{"index": False, **kwargs})
+
+    def _update_value_from_grid(self):
+        if not self.grid.columnar:
+            self._value = self.grid.value
+            # ^ in columnar mode rows are not materialized to keep _value in sync.
+        self.value_version += 1
 
     @property
     def di_row_value(self):
@@ -86,6 +86,7 @@ from pydantic import validator
 import uuid
 from uuid import UUID
 import functools
+import bisect
 from ipyautoui.constants import (
     ADD_BUTTON_KWARGS,
     REMOVE_BUTTON_KWARGS,
@@ -106,6 +107,7 @@ TOGGLE_BUTTON_KWARGS = frozenmap(
 # -
 from ipyautoui.autowidgets import create_widget_caller
 from ipyautoui.autoipywidget import AutoIpywidget
+from ipyautoui._utils import close_widget
 
 
 # +
@@ -171,6 +173,11 @@ class IterableItem(BaseModel):
         else:
             return v
 
+    def close(self):
+        """close the widgets of the row (including the item)"""
+        for w in [self.row, self.add, self.remove, self.label, self.item]:
+            close_widget(w)
+
 
 # # +
 class Array(widgets.VBox, traitlets.HasTraits):
@@ -181,6 +188,7 @@ class Array(widgets.VBox, traitlets.HasTraits):
     _show_hash = traitlets.Unicode(allow_none=True)
     _add_remove_controls = traitlets.Unicode(allow_none=True)
     _sort_on = traitlets.Unicode(allow_none=True)
+    _holding_changes = False  # True whilst the value of rows is set in bulk
 
     @validate("show_hash")
     def _validate_show_hash(self, proposal):
@@ -202,17 +210,19 @@ class Array(widgets.VBox, traitlets.HasTraits):
             raise ValueError(
                 f'{proposal} given. allowed values of _add_remove_controls are "add_remove", "append_only", "remove_only", None only'
             )
-        return proposal
+        return proposal.value
 
     @validate("_sort_on")
-    def _validate_add_remove_controls(self, proposal):
+    def _validate_sort_on(self, proposal):
         if proposal.value not in ["index", "key", None]:
             raise ValueError(
                 f'{proposal} given. allowed values of sort_on are "index", "key" and None only'
             )
-        return proposal
+        return proposal.value
 
     def _update_value(self, onchange):
+        if self._holding_changes:
+            return
         self._value = [a.item.value for a in self.iterable]
 
     # -----------------------------------------------------------------------------------
@@ -295,9 +305,30 @@ class Array(widgets.VBox, traitlets.HasTraits):
 
     @value.setter
     def value(self, value: typing.List):
-        self.items = [self.fn_add() for v in value]
-        for n, v in enumerate(value):
-            self.items[n].value = v
+        """the existing rows are reused (their value is set). rows are only created,
+        or removed and closed, for the difference in length."""
+        n = len(self.iterable)
+        self._holding_changes = True
+        try:
+            for row, v in zip(self.iterable, value):
+                row.item.value = v
+            added = []
+            for m, v in enumerate(value[n:]):
+                item = self.fn_add()
+                item.value = v
+                added.append(IterableItem(index=n + m, key=uuid.uuid4(), item=item))
+        finally:
+            self._holding_changes = False
+        removed = self.iterable[len(value) :]
+        self.iterable = self.iterable[: len(value)] + added
+        if added or removed:
+            self._update_rows_box()
+            for row in added:
+                self._update_buttonbar(row.index)
+                self._init_row_controls(key=row.key)
+            self._update_labels()
+        for row in removed:
+            row.close()
         self._update_value("onchange")
 
     @property
@@ -306,10 +337,63 @@ class Array(widgets.VBox, traitlets.HasTraits):
 
     @items.setter
     def items(self, value: typing.List):
+        removed = [r for r in self.iterable if not any(r.item is v for v in value)]
         self.iterable = self._init_iterable(value)
         self._update_rows_box()
         self._update_rows()
         self._init_controls()
+        for row in removed:
+            row.close()
+
+    @property
+    def iterable(self) -> typing.List[IterableItem]:
+        """the rows, in order. `_index` maps the key of each to it"""
+        return self._iterable
+
+    @iterable.setter
+    def iterable(self, value: typing.List[IterableItem]):
+        self._iterable = list(value)
+        self._sorted_keys = None
+        if self.sort_on == "key":
+            self._iterable.sort(key=lambda i: str(i.key))
+            self._sorted_keys = [str(i.key) for i in self._iterable]
+            # ^ kept in step with _iterable. used to find where to insert rows
+        self._index = {}
+        for n, i in enumerate(self._iterable):
+            i.index = n
+            self._index[i.key] = i
+
+    def _insert_iterable_item(self, position: int, item: IterableItem):
+        """insert a row. only the rows after it are re-indexed"""
+        self._iterable.insert(position, item)
+        self._index[item.key] = item
+        if self._sorted_keys is not None:
+            self._sorted_keys.insert(position, str(item.key))
+        for n in range(position, len(self._iterable)):
+            self._iterable[n].index = n
+
+    def _pop_iterable_item(self, position: int) -> IterableItem:
+        """remove a row. only the rows after it are re-indexed"""
+        item = self._iterable.pop(position)
+        del self._index[item.key]
+        if self._sorted_keys is not None:
+            del self._sorted_keys[position]
+        for n in range(position, len(self._iterable)):
+            self._iterable[n].index = n
+        return item
+
+    @property
+    def sort_on(self):
+        return self._sort_on
+
+    @sort_on.setter
+    def sort_on(self, value: str):
+        self._sort_on = value
+        if hasattr(self, "_iterable"):
+            self.iterable = self.iterable  # sorted if sort_on == "key"
+            if hasattr(self, "rows_box"):
+                self._update_rows_box()
+                self._update_labels()
 
     @property
     def iterable_keys(self):
@@ -426,42 +510,51 @@ class Array(widgets.VBox, traitlets.HasTraits):
             self._style_nth_buttonbar(index)
 
     def _update_buttonbar_box(self, index):
+        row = self.iterable[index]
         if self.add_remove_controls is None:
             buttons_box = []
         else:
-            self.iterable[index].add = widgets.Button(layout=dict(BUTTON_MIN_SIZE))
-            self.iterable[index].remove = widgets.Button(layout=dict(BUTTON_MIN_SIZE))
-            buttons_box = [self.iterable[index].add, self.iterable[index].remove]
-        self.iterable[index].row.children[0].children = buttons_box
+            old = [row.add, row.remove]
+            row.add = widgets.Button(layout=dict(BUTTON_MIN_SIZE))
+            row.remove = widgets.Button(layout=dict(BUTTON_MIN_SIZE))
+            buttons_box = [row.add, row.remove]
+            [b.close() for b in old]
+        row.row.children[0].children = buttons_box
 
     def _update_buttonbar(self, index):
         self._update_buttonbar_box(index)
-        self._style_buttonbar(index)
+        row = self.iterable[index]
+        with row.add.hold_sync(), row.remove.hold_sync():
+            self._style_buttonbar(index)  # one message per button
 
     def _update_buttonbars(self):
         [self._update_buttonbar(index) for index, item in enumerate(self.iterable)]
 
     def _update_label(self, index):
+        """update the label of a row. only changes are sent to the front end"""
+        row = self.iterable[index]
         if self.show_hash is None:
-            labels_box = []
-            self.iterable[index].row.children[1].children = labels_box
-            return
-        if self.show_hash == "index":
-            label = str(self.iterable[index].index).zfill(self.zfill) + ". "
-        elif self.show_hash == "key":
-            label = str(self.iterable[index].key)
+            labels_box = ()
         else:
-            label = ""
-        self.iterable[index].label.value = f"<b>{label}</b>"
-        labels_box = [self.iterable[index].label]
-        self.iterable[index].row.children[1].children = labels_box
+            if self.show_hash == "index":
+                label = str(row.index).zfill(self.zfill) + ". "
+            elif self.show_hash == "key":
+                label = str(row.key)
+            else:
+                label = ""
+            if row.label.value != f"<b>{label}</b>":
+                row.label.value = f"<b>{label}</b>"
+            labels_box = (row.label,)
+        if row.row.children[1].children != labels_box:
+            row.row.children[1].children = labels_box
 
-    def _update_labels(self):
-        [self._update_label(index) for index, item in enumerate(self.iterable)]
+    def _update_labels(self, start=0):
+        """update the labels of the rows from start (i.e. those whose index changed)"""
+        [self._update_label(index) for index in range(start, len(self.iterable))]
 
     def _update_row(self, index):
         self._update_buttonbar(index)
-        self._update_labels()
+        self._update_label(index)
 
     def _update_rows(self):
         [self._update_row(index) for index, item in enumerate(self.iterable)]
@@ -470,6 +563,23 @@ class Array(widgets.VBox, traitlets.HasTraits):
         self.rows_box.children = [i.row for i in self.iterable]
         self._add_from_zero_display()
 
+    def _insert_row_box(self, index):
+        """insert the row at index into rows_box rather than resetting every row"""
+        children = list(self.rows_box.children)
+        if len(children) != len(self.iterable) - 1 or len(self.iterable) == 1:
+            self._update_rows_box()  # not in sync (or showing add_from_zero)
+            return
+        children.insert(index, self.iterable[index].row)
+        self.rows_box.children = children
+
+    def _remove_row_box(self, row: IterableItem):
+        """remove a row (no longer in iterable) from rows_box"""
+        children = [c for c in self.rows_box.children if c is not row.row]
+        if len(children) != len(self.iterable):
+            self._update_rows_box()
+            return
+        self.rows_box.children = children
+
     @property
     def add_remove_controls(self):
         if self._add_remove_controls is None:
@@ -535,7 +645,8 @@ class Array(widgets.VBox, traitlets.HasTraits):
     def _init_row_controls(self, key=None):
         if self.add_remove_controls == "append_only":
             # self.iterable[0].add = widgets.Button(layout=dict(BUTTON_MIN_SIZE))
-            self.iterable[0].add.on_click(self._add_row)
+            if key == self.iterable[0].key:
+                self.iterable[0].add.on_click(self._add_row)
             # self._style_zeroth_buttonbar()
         else:
             self._get_attribute(key, "add").on_click(
@@ -560,19 +671,8 @@ class Array(widgets.VBox, traitlets.HasTraits):
         self.toggle_button.observe(self._toggle_button, "value")
         [self._init_row_controls(key=i.key) for i in self.iterable]
 
-    def _sort_iterable(self):
-        if self.sort_on == "index":
-            sort = sorted(self.iterable, key=lambda k: k.index)
-        elif self.sort_on == "key":
-            sort = sorted(self.iterable, key=lambda k: str(k.key))
-        else:
-            sort = self.iterable
-        for n, s in enumerate(sort):
-            s.index = n
-        return sort
-
     def _get_attribute(self, key, get):
-        return [getattr(r, get) for r in self.iterable if r.key == key][0]
+        return getattr(self._index[key], get)
 
     def _add_row(self, onclick, key=None):
         if self.fn_add_dialogue is None:
@@ -590,16 +690,12 @@ class Array(widgets.VBox, traitlets.HasTraits):
             return None
 
         if key is None:
-            if len(self.iterable) == 0:
-                index = 0
-            else:
-                key = self.iterable[-1].key
-                index = self._get_attribute(key, "index")  # append
+            position = len(self.iterable)  # append
         else:
-            index = self._get_attribute(key, "index")
+            position = self._get_attribute(key, "index") + 1
 
         if new_key is not None:
-            if new_key in [i.key for i in self.iterable]:
+            if new_key in self._index:
                 print(f"{new_key} already exists in keys")
                 return None
 
@@ -612,19 +708,22 @@ class Array(widgets.VBox, traitlets.HasTraits):
             new_item = item
 
         item = IterableItem(
-            index=index,
+            index=position,
             key=new_key,
             item=new_item,
         )
-        self.iterable.insert(index + 1, item)
-        self.iterable = self._sort_iterable()  # update map
-        index = self._get_attribute(item.key, "index")
-        self._update_row(index)
-        self._update_rows_box()
+        if self._sorted_keys is not None:
+            position = bisect.bisect(self._sorted_keys, str(item.key))
+        self._insert_iterable_item(position, item)
+        self._update_buttonbar(position)
+        if self.show_hash == "index":
+            self._update_labels(start=position)  # the index of these has changed
+        else:
+            self._update_label(position)
+        self._insert_row_box(position)
         self._init_row_controls(item.key)  # init controls
         if self.watch_value:
             self._update_value("change")
-        self._add_from_zero_display()
 
     def _remove_rows(self, onclick, key=None):
         self.remove_row(key=key)
@@ -641,12 +740,13 @@ class Array(widgets.VBox, traitlets.HasTraits):
         else:
             n = self._get_attribute(key, "index")
             # print(f'n={str(n)}')
-            self.iterable.pop(n)
-            self.iterable = self._sort_iterable()
+            removed = self._pop_iterable_item(n)
             if self.watch_value:
                 self._update_value("change")
-            self._update_rows_box()
-            self._update_labels()
+            self._remove_row_box(removed)
+            if self.show_hash == "index":
+                self._update_labels(start=n)  # the index of these has changed
+            removed.close()
 
         if remove_kwargs is None:
             remove_kwargs = {}
@@ -710,11 +810,15 @@ class Dictionary(Array):
         return {i.key: i.item for i in self.iterable}
 
     @items.setter
-    def items(self, value: typing.List):
+    def items(self, value: typing.Dict):
+        items = list(value.values())
+        removed = [r for r in self.iterable if not any(r.item is v for v in items)]
         self.iterable = self._init_iterable(value)
         self._update_rows_box()
         self._update_rows()
         self._init_controls()
+        for row in removed:
+            row.close()
 
     def _init_iterable(self, items):
         return [
@@ -19,6 +19,7 @@
 
 import pathlib
 import functools
+import concurrent.futures
 import pandas as pd
 import ipywidgets as widgets
 from IPython.display import display, Markdown, clear_output
@@ -103,10 +104,14 @@ class SaveButtonBar(widgets.HBox):
         self.revert.on_click(self._revert)
 
     def _save(self, click):
-        self.fn_save()
-        self.message.value = markdown(
-            f'_changes saved: {datetime.now().strftime("%H:%M:%S")}_'
-        )
+        result = self.fn_save()
+        if isinstance(result, concurrent.futures.Future) and not result.done():
+            self.message.value = markdown("_⏳ saving..._")
+            # ^ fn_save writes in the background and reports when it is complete
+        else:
+            self.message.value = markdown(
+                f'_changes saved: {datetime.now().strftime("%H:%M:%S")}_'
+            )
         self._unsaved_changes(False)
         if isinstance(self.fn_onsave, typing.Callable):
             self.fn_onsave()
@@ -17,6 +17,15 @@ class ExampleDataFrameSchema(BaseModel):
             default_factory=lambda: [], format="dataframe"
         )
 
+class ExampleNullableCols(BaseModel):
+    string: typing.Optional[str] = None
+    integer: typing.Optional[int] = None
+
+class ExampleNullableSchema(BaseModel):
+    dataframe: typing.List[ExampleNullableCols] = Field(
+            default_factory=lambda: [], format="dataframe"
+        )
+
 
 
 def get_di():
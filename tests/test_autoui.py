@@ -5,13 +5,23 @@
 from pprint import pprint
 import shutil
 import pathlib
+import json
+import typing
+import asyncio
+import pytest
+from pydantic import Field
 
 # from src.ipyautoui.test_schema import TestSchema
 
 # from ipyautoui.tests import test_display_widget_mapping
 from .constants import DIR_TESTS, DIR_FILETYPES
-from .example_objects import ExampleSchema
+from .example_objects import (
+    ExampleSchema,
+    ExampleDataFrameSchema,
+    ExampleDataFrameCols,
+)
 from ipyautoui import AutoUi, AutoDisplay, AutoVjsf
+from ipyautoui import _utils
 from ipyautoui.autoipywidget import AutoObject
 
 DIR_TEST_DATA = DIR_TESTS / "test_data"
@@ -30,3 +40,249 @@ class TestUi:
     # def test_display_file(self):
     #     fpths = list(pathlib.Path(DIR_FILETYPES).glob("*"))
     #     d0 = DisplayFile(fpths[0])
+
+    def test_resolve_schema_cached(self):
+        from ipyautoui.automapschema import resolve_schema
+
+        _, sch0 = resolve_schema(ExampleSchema)
+        _, sch1 = resolve_schema(ExampleSchema)
+        assert sch0 == sch1
+        assert sch0["properties"] is sch1["properties"]
+        schema = {**sch0, "properties": dict(sch0["properties"])}
+        _, sch2 = resolve_schema(schema)
+        _, sch3 = resolve_schema(schema)
+        assert sch2["properties"] is sch3["properties"]  # cached by identity
+        _, sch4 = resolve_schema({**schema, "properties": dict(schema["properties"])})
+        assert sch4 == sch2 and sch4["properties"] is not sch2["properties"]
+
+    def test_widgets_map_memoized(self):
+        import ipyautoui.automapschema as aumap
+        from ipyautoui.autowidgets import Textarea
+
+        di_update = {"Text": aumap.WidgetMapper(fn_filt=aumap.is_Text, widget=Textarea)}
+        map0 = aumap.widgets_map(di_update)
+        map1 = aumap.widgets_map(dict(di_update))
+        assert map0 is map1
+        assert map0["Text"].widget is Textarea
+        assert aumap.widgets_map()["Text"].widget is not Textarea
+        aumap.clear_widgets_map_cache()
+        assert aumap.widgets_map(di_update) is not map0
+
+    def test_lazy_nested(self):
+        from ipyautoui.test_schema import RecursiveNest
+        from ipyautoui.autoipywidget import LazyWidget
+
+        ui = AutoObject(RecursiveNest, lazy_nested=True)
+        lazy = ui.di_widgets["nested"]
+        assert isinstance(lazy, LazyWidget)
+        assert not lazy.is_built
+        value = {"string1": "a", "int_slider1": 1, "int_text1": 3}
+        ui.value = {**ui.value, "nested": value}
+        assert ui.value["nested"] == value
+        widget = lazy.build()
+        assert widget.value == value
+        widget.di_widgets["string1"].value = "b"
+        assert ui.value["nested"]["string1"] == "b"
+
+    def test_value_change_path(self):
+        from ipyautoui.test_schema import NestedObject
+        from pydantic import BaseModel, Field
+
+        class Outer(BaseModel):
+            text: str = "a"
+            nested: NestedObject = Field(default_factory=NestedObject)
+
+        ui = AutoObject(Outer)
+        ui.di_widgets["nested"].di_widgets["string1"].value = "b"
+        assert ui.value["nested"]["string1"] == "b"
+        assert ui.value_change == {
+            "path": ["nested", "string1"],
+            "old": "adsf",
+            "new": "b",
+        }
+
+    def test_value_set_batched(self):
+        from ipyautoui.test_schema import TestAutoLogicSimple
+
+        ui = AutoObject(TestAutoLogicSimple)
+        changes = []
+        ui.observe(lambda c: changes.append(c), "_value")
+        ui.value = dict(ui.value, text="b", int_slider=3)
+        assert len(changes) == 1
+        assert ui.value["text"] == "b"
+        assert ui.value["int_slider"] == 3
+        assert ui.value_change["path"] == []
+
+    def test_watch_editgrid(self):
+        ui = AutoObject(ExampleDataFrameSchema)
+        rows = [{"string": "a", "floater": 1.0}]
+        ui.di_widgets["dataframe"].value = rows
+        assert ui.value["dataframe"] == rows
+        assert ui.value_change["path"] == ["dataframe"]
+        assert ui.value_change["new"] == rows
+
+    def test_update_policy(self):
+        from ipyautoui.test_schema import TestAutoLogicSimple
+
+        ui = AutoObject(TestAutoLogicSimple, update_policy="on_blur")
+        assert ui.di_widgets["text"].continuous_update is False
+        ui = AutoObject(TestAutoLogicSimple, update_policy="debounce:300ms")
+        # no running event loop: debounced edits propagate immediately
+        ui.di_widgets["text"].value = "b"
+        assert ui.value["text"] == "b"
+        ui.flush_updates()
+        assert ui.value_change["path"] == ["text"]
+
+    def test_update_policy_debounce(self):
+        from ipyautoui.test_schema import TestAutoLogicSimple
+
+        async def main():
+            ui = AutoObject(TestAutoLogicSimple, update_policy="debounce:50ms")
+            changes = []
+            ui.observe(lambda c: changes.append(c["new"]), "_value")
+            for s in ["a", "ab", "abc"]:  # a burst of edits...
+                ui.di_widgets["text"].value = s
+            assert changes == []
+            await asyncio.sleep(0.1)
+            assert len(changes) == 1  # ...collapses into a single change
+            assert changes[0]["text"] == "abc"
+
+            ui.di_widgets["text"].value = "pending"
+            ui.value = {**ui.value, "text": "set"}  # supersedes the pending edit
+            n, value_change = len(changes), ui.value_change
+            await asyncio.sleep(0.1)
+            assert len(changes) == n and ui.value_change is value_change
+            assert ui.value["text"] == "set"
+
+        asyncio.run(main())
+
+    def test_file_write_behind(self, tmp_path):
+        path = tmp_path / "test.json"
+        ui = AutoUi(ExampleSchema, path=path, write_behind=True)
+        ui.value = {"text": "a"}
+        future = ui.file()
+        ui.value = {"text": "b"}
+        ui.file()
+        future.result()
+        ui.flush_writes()
+        assert ui.parse_file() == {"text": "b"}
+        assert list(tmp_path.glob("*.tmp")) == []  # temp file replaced the file
+        executor = ui._write_queue._executor
+        ui.value = {"text": "c"}
+        ui.file()
+        ui.close()  # queued writes complete and the writer thread is stopped
+        assert ui.parse_file() == {"text": "c"}
+        assert executor._shutdown
+
+    def test_json_backends(self, tmp_path):
+        path = tmp_path / "test.json"
+        ui = AutoUi(ExampleSchema, path=path)
+        ui.value = {"text": "a"}
+        for backend in _utils.JSON_BACKENDS:
+            if backend == "json" or _utils.check_installed(backend):
+                s = _utils.model_dumps(ui.model(**ui.value), backend=backend)
+                assert _utils.loads(s, backend=backend)["text"] == "a"
+        ui.compact_json = True
+        ui.file()
+        assert "\n" not in path.read_text()
+        assert ui.parse_file()["text"] == "a"
+        model = ui.model(text="é")
+        _utils.file(model, path, ensure_ascii=False)  # json.dumps kwargs accepted
+        assert "é" in path.read_text(encoding="utf-8")
+        _utils.file(model, path, exclude={"text"})  # as are model.dict kwargs
+        assert _utils.loads(path.read_text()) == {}
+
+    def test_load_file_stream(self, tmp_path):
+        path = tmp_path / "test.json"
+        rows = [{"string": str(n), "floater": n} for n in range(250)]
+        path.write_text(json.dumps({"dataframe": rows}))
+        ui = AutoUi(ExampleDataFrameSchema, path=path)
+        assert ui._stream_keys == ["dataframe"]
+        chunks = []
+        ui.autowidget.di_widgets["dataframe"].grid.observe(
+            lambda c: chunks.append(len(c["new"])), "_value"
+        )
+        ui.load_file(stream=True, chunk_size=10)
+        assert chunks == [10, 30, 70, 150, 250]  # chunks double in size
+        assert ui.value == ui.parse_file()
+        assert ui.save_buttonbar.unsaved_changes.value == False
+
+        rows[42]["floater"] = "not a float"
+        path.write_text(json.dumps({"dataframe": rows}))
+        with pytest.raises(ValueError, match="rows 30 to 69"):
+            ui.load_file(stream=True, chunk_size=10)
+
+    def test_load_file_stream_debounced(self, tmp_path):
+        from ipyautoui.test_schema import TestAutoLogicSimple
+
+        path = tmp_path / "test.json"
+        path.write_text(json.dumps({"text": "loaded"}))
+
+        async def main():
+            ui = AutoUi(TestAutoLogicSimple, path=path, update_policy="debounce:10ms")
+            ui.autowidget.di_widgets["text"].value = "edited"  # pending
+            await ui._stream_file(path)
+            value_change = ui.autowidget.value_change
+            await asyncio.sleep(0.05)
+            assert ui.autowidget.value_change is value_change  # no stale change
+            assert ui.value["text"] == "loaded"
+
+        asyncio.run(main())
+
+    def test_load_file_stream_empty(self, tmp_path):
+        class Model(ExampleDataFrameSchema):
+            dataframe: typing.List[ExampleDataFrameCols] = Field(
+                default_factory=lambda: [ExampleDataFrameCols()], format="dataframe"
+            )
+
+        path = tmp_path / "test.json"
+        path.write_text(json.dumps({"dataframe": []}))
+        assert list(_utils.iter_json_file(path, ["dataframe"])) == [("dataframe", [])]
+        ui = AutoUi(Model, path=path)
+        ui.load_file(stream=True)
+        assert ui.value["dataframe"] == []  # not replaced by the default
+        assert ui.value == ui.parse_file()
+
+    def test_iter_json_file_ijson(self, tmp_path, monkeypatch):
+        pytest.importorskip("ijson")
+        path = tmp_path / "test.json"
+        data = {
+            "rows": [{"a": [1, 2]}, {"a": []}, 3, [4]],
+            "empty": [],
+            "not_rows": {"a": [1]},  # a stream key that isn't an array
+            "other": {"b": None},
+        }
+        path.write_text(json.dumps(data))
+        keys = ["rows", "empty", "not_rows"]
+        chunks = list(_utils.iter_json_file(path, keys, chunk_size=1))
+        assert chunks == [
+            ("rows", []),
+            ("rows", [{"a": [1, 2]}]),
+            ("rows", [{"a": []}, 3]),
+            ("rows", [[4]]),
+            ("empty", []),
+            ("not_rows", {"a": [1]}),
+            ("other", {"b": None}),
+        ]
+        monkeypatch.setattr(_utils, "check_installed", lambda name: False)
+        no_ijson = list(_utils.iter_json_file(path, keys, chunk_size=1))
+        assert sorted(no_ijson, key=str) == sorted(chunks, key=str)
+
+    def test_save_on_edit(self, tmp_path):
+        path = tmp_path / "test.json"
+        ui = AutoUi(ExampleSchema, path=path, save_controls="save_on_edit")
+        ui.autowidget.di_widgets["text"].value = "edited"  # no loop: saved now
+        assert ui.parse_file() == {"text": "edited"}
+
+        saves = []
+        ui._save_on_edit = lambda change=None: saves.append(change)
+        ui.save_controls = "save_on_edit"  # replaces the previous autosave observer
+        ui.autowidget.di_widgets["text"].value = "edited again"
+        assert len(saves) == 1
+        assert ui.parse_file() == {"text": "edited"}  # not saved by the old observer
+
+        ui.save_controls = "save_buttonbar"  # autosave stopped
+        ui.autowidget.di_widgets["text"].value = "not saved"
+        assert len(saves) == 1
+        assert ui.parse_file() == {"text": "edited"}
+        assert ui.save_buttonbar.unsaved_changes.value == True
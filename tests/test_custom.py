@@ -1,4 +1,6 @@
 import shutil
+import asyncio
+import json
 import pytest
 
 # from src.ipyautoui.test_schema import TestSchema
@@ -7,9 +9,11 @@ import pytest
 from .constants import DIR_TESTS, DIR_FILETYPES
 from .example_objects import (
     fn_add,
+    TestItem,
     get_descriptions,
     ExampleSchema,
     ExampleDataFrameSchema,
+    ExampleNullableSchema,
 )
 from ipyautoui.custom import (
     Array,
@@ -19,7 +23,17 @@ from ipyautoui.custom import (
     LoadProject,
 )
 from ipyautoui.custom.modelrun import RunName
-from ipyautoui.custom.editgrid import BaseForm, GridWrapper, EditGrid, ButtonBar
+from ipyautoui.custom.editgrid import (
+    BaseForm,
+    GridWrapper,
+    EditGrid,
+    ButtonBar,
+    ColumnFilter,
+    BatchDataHandler,
+    DataHandler,
+    RowValidationError,
+)
+from ipyautoui._utils import run_sync
 from ipyautoui.automapschema import attach_schema_refs
 
 
@@ -32,6 +46,9 @@ shutil.rmtree(
 dataframe_schema = attach_schema_refs(ExampleDataFrameSchema.schema())["properties"][
     "dataframe"
 ]
+nullable_schema = attach_schema_refs(ExampleNullableSchema.schema())["properties"][
+    "dataframe"
+]
 
 
 class TestCustom:
@@ -48,6 +65,68 @@ class TestCustom:
         }
         arr = Array(**di_arr)
 
+    def test_iterables_array_value(self):
+        li = []
+
+        def fn(value=None):
+            li.append(TestItem(di=value or {"a": True}))
+            return li[-1]
+
+        arr = Array(value=[{"a": True}] * 3, fn_add=fn)
+        arr.value = [{"b": False}] * 5
+        assert len(li) == 5  # the 3 rows are reused
+        assert arr.items[:3] == li[:3]
+        arr.value = [{"c": True}] * 2
+        assert len(li) == 5
+        assert [i.comm is None for i in li] == [False, False, True, True, True]
+        assert arr.value == [{"c": True}] * 2
+        assert len(arr.rows_box.children) == 2
+
+    def test_iterables_array_index(self):
+        arr = Array(items=[fn_add() for n in range(3)], fn_add=fn_add)
+        k0, k1, k2 = arr.iterable_keys
+        arr.add_row(key=k0, new_key="new")
+        assert arr.iterable_keys == [k0, "new", k1, k2]
+        indexes = [arr._get_attribute(k, "index") for k in arr.iterable_keys]
+        assert indexes == [0, 1, 2, 3]
+        arr.remove_row(key=k0)
+        assert arr.iterable_keys == ["new", k1, k2]
+        assert arr._get_attribute(k2, "index") == 2
+        assert k0 not in arr._index
+
+    def test_iterables_dict_sort_on_key(self):
+        items = {k: fn_add() for k in ["b", "z", "a"]}  # not sorted
+        di = Dictionary(items=items, fn_add=fn_add, sort_on="key")
+        assert di.iterable_keys == ["a", "b", "z"]
+        di.add_row(new_key="c")
+        assert di.iterable_keys == ["a", "b", "c", "z"]
+        assert list(di.rows_box.children) == [i.row for i in di.iterable]
+        di.remove_row(key="b")
+        di.add_row(new_key="y")
+        assert di.iterable_keys == ["a", "c", "y", "z"]
+
+    def test_iterables_array_rows_box(self):
+        arr = Array(items=[fn_add() for n in range(4)], fn_add=fn_add)
+        changed = []
+        for row in arr.iterable:
+            row.label.observe(lambda c: changed.append(c["new"]), "value")
+        arr.add_row(key=arr.iterable_keys[1])
+        assert changed == ["<b>03. </b>", "<b>04. </b>"]  # only those after the new row
+        assert list(arr.rows_box.children) == [i.row for i in arr.iterable]
+        arr.remove_row(key=arr.iterable_keys[0])
+        assert list(arr.rows_box.children) == [i.row for i in arr.iterable]
+        assert [i.label.value for i in arr.iterable] == [
+            f"<b>0{n}. </b>" for n in range(4)
+        ]
+
+    def test_iterables_dict_items_closed(self):
+        items = {k: fn_add() for k in ["a", "b", "c"]}
+        di = Dictionary(items=items, fn_add=fn_add)
+        removed = di.iterable[2]
+        di.items = {"a": items["a"], "b": items["b"], "d": fn_add()}
+        assert removed.item.comm is None and removed.row.comm is None
+        assert items["a"].comm is not None  # kept rows aren't closed
+
     def test_iterables_dict(self):
         di_arr = {
             "items": {"key": fn_add()},
@@ -123,6 +202,270 @@ class TestCustom:
 
         grid = GridWrapper(schema=dataframe_schema,)
 
+    def test_grid_wrapper_diff_update(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(5)]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        data = grid._data
+        grid.value = value[:2] + [{"string": "new", "floater": 2.0}] + value[3:]
+        assert grid._data is data  # updated by cell, table not resent
+        assert grid._data["data"][2]["String"] == "new"
+        grid.value = grid.value + [{"string": "5", "floater": 5.0}]
+        assert grid._data is not data  # row inserted, table resent
+        assert len(grid._data["data"]) == 6
+        grid.value[1] = {"string": "in-place", "floater": 1.0}
+        grid.value = grid.value  # nothing to diff against: the table is resent
+        assert grid._data["data"][1]["String"] == "in-place"
+
+    def test_grid_wrapper_sig_figs(self):
+        value = [
+            {"string": "a", "floater": 3.14159},
+            {"string": "b", "floater": -271.828},
+        ]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        assert grid.data["Floater"].tolist() == [3.14, -272.0]
+        grid.set_row_value(1, {"string": "b", "floater": -0.0123456})
+        assert grid._data["data"][1]["Floater"] == -0.0123
+
+    def test_grid_wrapper_column_spec(self):
+        grid = GridWrapper(schema=dataframe_schema, order_cols=["Floater"])
+        spec = grid.column_spec
+        assert grid.column_spec is spec  # cached
+        assert spec.order == ["Floater", "String"]
+        assert grid.aui_sig_figs == {"Floater": 3}
+        grid.ignore_cols = ["String"]
+        assert grid.column_spec is not spec  # invalidated
+        assert grid.column_spec.order == ["Floater"]
+
+    def test_grid_wrapper_columnar(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(5)]
+        grid = GridWrapper(schema=dataframe_schema, value=value, columnar=True)
+        assert grid._value == []  # rows not stored as dicts
+        assert grid.value == value
+        assert grid.get_rows([1]) == [value[1]]
+        grid.append_rows([{"string": "5", "floater": 5.0}])
+        grid.delete_rows([0, 1])
+        assert [v["string"] for v in grid.value] == ["2", "3", "4", "5"]
+        assert len(grid._data["data"]) == 4
+
+    def test_grid_wrapper_columnar_nulls(self):
+        value = [{"string": "a", "integer": 3}, {"string": None, "integer": None}]
+        grid = GridWrapper(schema=nullable_schema, value=value, columnar=True)
+        assert grid.value == value  # not NaN or 3.0
+        assert type(grid.value[0]["integer"]) is int
+        assert grid.get_rows([1]) == [value[1]]
+        json.dumps(grid.value, allow_nan=False)
+
+    def test_editgrid_columnar_value_version(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(5)]
+        editgrid = EditGrid(schema=dataframe_schema, value=value, columnar=True)
+        versions = []
+        editgrid.observe(lambda c: versions.append(c["new"]), "value_version")
+        editgrid.value = value[:2]
+        assert editgrid._value == []  # not kept in sync in columnar mode
+        assert len(versions) == 1
+
+    def test_grid_wrapper_validate(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(5)]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        value[1] = {"string": 1, "floater": "a"}
+        value[3] = {"string": "3"}
+        assert list(grid.validate(value)) == [1, 3]
+        assert grid.validate(value)[1] == [
+            "string: 1 is not of type string",
+            "floater: 'a' is not of type number",
+        ]
+        with pytest.raises(RowValidationError) as e:
+            grid.value = value
+        assert "Rejected Columns: ['floater']" in e.value.errors[3][0]
+        assert len(grid.value) == 5  # not changed
+        with pytest.raises(RowValidationError) as e:
+            grid.set_row_value(2, {"string": 2, "floater": 2.0})
+        assert list(e.value.errors) == [2]
+        assert grid.value[2] == {"string": "2", "floater": 2.0}  # not changed
+
+        validated = []
+        grid.validate = lambda v: validated.append(len(v)) or {}
+        grid.value = grid.value[:4] + [{"string": "5", "floater": 5.0}]
+        assert validated == [1]  # only the changed row
+
+    def test_editgrid_csv(self, tmp_path):
+        value = [{"string": f"0{n}", "floater": n / 2} for n in range(5)]
+        editgrid = EditGrid(schema=dataframe_schema, value=value)
+        editgrid.to_csv(tmp_path / "test.csv", by_title=True)
+        progress = []
+        editgrid = EditGrid.from_csv(
+            dataframe_schema,
+            tmp_path / "test.csv",
+            chunksize=2,
+            fn_progress=progress.append,
+        )
+        assert editgrid.grid.columnar
+        assert editgrid.value == value  # titles mapped to fields. "0n" read as str
+        assert progress == [2, 4, 5]
+
+    def test_editgrid_csv_blank_cells(self, tmp_path):
+        (tmp_path / "test.csv").write_text("string,integer\na,1\n,\n")
+        value = [{"string": "a", "integer": 1}, {"string": None, "integer": None}]
+        for columnar in [False, True]:
+            editgrid = EditGrid(schema=nullable_schema, columnar=columnar)
+            editgrid.read_csv(tmp_path / "test.csv")
+            assert editgrid.value == value  # not NaN or 1.0
+            assert type(editgrid.value[0]["integer"]) is int
+
+    def test_editgrid_paged(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(25)]
+        editgrid = EditGrid(schema=dataframe_schema, value=value, page_size=10)
+        grid = editgrid.grid
+        assert len(grid._data["data"]) == 10  # only the page is sent
+        grid.page = 2
+        assert [r["key"] for r in grid._data["data"]] == [20, 21, 22, 23, 24]
+        assert editgrid.pager.message.value.startswith("page 3 of 3")
+        grid.delete_rows(list(range(20, 25)))
+        assert grid.page == 1
+
+    def test_grid_wrapper_query(self):
+        value = [{"string": f"s{n % 3}", "floater": float(n)} for n in range(10)]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        grid.query(
+            filters=[ColumnFilter(column="Floater", min=2, max=8)],
+            sort_by=[("string", True), ("floater", False)],
+        )
+        assert grid.view_keys == [6, 3, 7, 4, 8, 5, 2]
+        assert [r["key"] for r in grid._data["data"]] == grid.view_keys
+        grid.filter_by_column_name("String", ["s0"])
+        assert grid.view_keys == [6, 3]
+        grid.query()
+        assert len(grid._data["data"]) == 10
+
+    def test_grid_wrapper_selected_keys(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(5)]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        grid.selections = [{"r1": 1, "r2": 2, "c1": 0, "c2": 1}]
+        assert grid.selected_keys == [1, 2]
+        grid._visible_rows = [4, 3, 2, 1, 0]  # e.g. sorted descending in browser
+        assert grid.selected_keys == [3, 2]
+        assert [r["String"] for r in grid.selected_rows_data] == ["3", "2"]
+
+    def test_grid_wrapper_move_rows(self):
+        value = [{"string": str(n), "floater": float(n)} for n in range(6)]
+        grid = GridWrapper(schema=dataframe_schema, value=value)
+        grid.move_rows([1, 2], 3)
+        assert [v["string"] for v in grid.value] == ["0", "3", "4", "1", "2", "5"]
+        grid._move_rows_up([3, 4])
+        assert [v["string"] for v in grid.value] == ["0", "3", "1", "2", "4", "5"]
+        assert [r["String"] for r in grid._data["data"]] == ["0", "3", "1", "2", "4", "5"]
+        grid.apply_permutation([5, 4, 3, 2, 1, 0])
+        assert [v["string"] for v in grid.value] == ["5", "4", "2", "1", "3", "0"]
+
+    def test_editgrid_batch_datahandler(self):
+        rows = {str(n): {"string": str(n), "floater": float(n)} for n in range(5)}
+        log = []  # (version, primary key, row or None if deleted)
+        calls = []
+
+        def post_many(values):
+            calls.append("post_many")
+            for v in values:
+                rows[v["string"]] = v
+                log.append((len(log) + 1, v["string"], v))
+
+        def delete_many(values):
+            calls.append("delete_many")
+            for v in values:
+                del rows[v["string"]]
+                log.append((len(log) + 1, v["string"], None))
+
+        def get_changes(since=None):
+            if since is None:
+                return {"version": len(log), "upserted": list(rows.values())}
+            changes = [l for l in log if l[0] > since]
+            return {
+                "version": len(log),
+                "upserted": [v for _, k, v in changes if v is not None],
+                "deleted": [k for _, k, v in changes if v is None],
+            }
+
+        datahandler = BatchDataHandler(
+            fn_post_many=post_many,
+            fn_patch_many=post_many,
+            fn_delete_many=delete_many,
+            fn_get_changes=get_changes,
+            primary_key="string",
+        )
+        editgrid = EditGrid(schema=dataframe_schema, datahandler=datahandler)
+        assert len(editgrid.value) == 5
+        run_sync(editgrid._datahandler_delete(editgrid.grid.get_rows([1, 2])))
+        run_sync(editgrid._datahandler_post([{"string": "5", "floater": 5.0}]))
+        run_sync(editgrid._reload_all_data())
+        assert calls == ["delete_many", "post_many"]
+        assert [v["string"] for v in editgrid.value] == ["0", "3", "4", "5"]
+
+    def test_editgrid_async_datahandler(self):
+        rows = [{"string": str(n), "floater": float(n)} for n in range(3)]
+
+        async def get_all_data():
+            await asyncio.sleep(0)
+            return list(rows)
+
+        async def delete(value):
+            await asyncio.sleep(0)
+            raise ValueError("backend unavailable")
+
+        datahandler = DataHandler(
+            fn_get_all_data=get_all_data,
+            fn_post=delete,
+            fn_patch=delete,
+            fn_delete=delete,
+            fn_copy=delete,
+        )
+
+        async def run():
+            editgrid = EditGrid(schema=dataframe_schema, datahandler=datahandler)
+            assert editgrid.is_in_flight  # loads without blocking
+            await editgrid._task
+            assert len(editgrid.value) == 3
+            editgrid.grid.selections = [{"r1": 0, "r2": 0, "c1": 0, "c2": 1}]
+            editgrid._delete()
+            assert len(editgrid.value) == 2  # optimistic
+            await editgrid._task
+            assert len(editgrid.value) == 3  # rolled back
+            assert "failed" in editgrid.button_bar.message.value
+
+        asyncio.run(run())
+
+    def test_editgrid_async_datahandler_queued(self):
+        rows = [{"string": "0", "floater": 0.0}]
+
+        async def get_all_data():
+            await asyncio.sleep(0)
+            return list(rows)
+
+        async def post(value):
+            await asyncio.sleep(0.05)  # slow backend
+            rows.append(value)
+
+        datahandler = DataHandler(
+            fn_get_all_data=get_all_data,
+            fn_post=post,
+            fn_patch=post,
+            fn_delete=post,
+            fn_copy=post,
+        )
+
+        async def run():
+            editgrid = EditGrid(schema=dataframe_schema, datahandler=datahandler)
+            await editgrid._task
+            for n in [1, 2]:  # save twice whilst the first is in flight
+                editgrid._edit_bool = False
+                editgrid.baseform.value = {"string": str(n), "floater": float(n)}
+                editgrid.baseform.save_button_bar._save(None)
+                assert editgrid.is_in_flight
+            await editgrid._task
+            assert [v["string"] for v in rows] == ["0", "1", "2"]
+            assert [v["string"] for v in editgrid.value] == ["0", "1", "2"]
+            assert "complete" in editgrid.button_bar.message.value
+
+        asyncio.run(run())
+
     def test_editgrid(self):
         grid = EditGrid(schema=dataframe_schema,)
 